@@ -32,9 +32,20 @@ app.add_typer(queue_app, name="queue")
 console = Console()
 
 
+def _apply_profile(name: str) -> None:
+    """Point this run at .user-data/profiles/<name> (same layout as PROFILE_NAME)."""
+    if not name:
+        return
+    settings.user_data_dir = str(_profiles_base_dir() / name)
+    settings.profile_name = name
+
+
 @app.command()
-def login():
+def login(
+    profile: str = typer.Option(None, "--profile", help="Perfil (.user-data/profiles/<nome>) a usar"),
+):
     """Abre navegador headful para login manual e salva a sessão (Playwright)."""
+    _apply_profile(profile)
     login_and_save_session()
 
 
@@ -42,8 +53,10 @@ def login():
 def search(
     keyword: str = typer.Option(..., "--keyword", "-k", help="Palavra-chave para busca"),
     limit: int = typer.Option(50, "--limit", "-l", help="Quantidade máxima de itens"),
+    profile: str = typer.Option(None, "--profile", help="Perfil (.user-data/profiles/<nome>) a usar"),
 ):
     """Executa scraping de busca autenticado e salva JSON/CSV em data/."""
+    _apply_profile(profile)
     rows = search_products(keyword=keyword, limit=limit)
     console.print(f"[green]OK[/]: coletados {len(rows)} itens para '{keyword}'.")
 
@@ -259,7 +272,7 @@ def env_validate():
     suggestion = suggest_region_for_domain(settings.shopee_domain)
     if suggestion:
         console.print(
-            f"Sugestão: para {settings.shopee_domain}, use LOCALE={suggestion['locale']} e TIMEZONE={suggestion['timezone']}"
+            f"Sugestão: para {settings.shopee_domain}, use LOCALE={suggestion.locale} e TIMEZONE={suggestion.timezone}"
         )
 
 
@@ -271,12 +284,13 @@ def metrics_summary(
     hours: int = typer.Option(0, "--hours", help="Janela em horas (0 = tudo)"),
     profile: str = typer.Option(None, "--profile", help="Filtrar por PROFILE_NAME"),
     proxy: str = typer.Option(None, "--proxy", help="Filtrar por PROXY_URL"),
+    cache: bool = typer.Option(False, "--cache/--no-cache", help="Mantém um rollup ao lado do log e lê só os eventos novos"),
 ):
     """Mostra taxa de sucesso, latência e bloqueios por perfil/proxy."""
     from src.shopee_scraper.metrics import run_report
 
     try:
-        run_report(Path(path), hours=hours, profile=profile, proxy=proxy)
+        run_report(Path(path), hours=hours, profile=profile, proxy=proxy, cache=cache)
     except Exception as e:
         console.print(f"[red]Erro[/]: {e}")
 
@@ -289,13 +303,20 @@ def metrics_export(
     proxy: str = typer.Option(None, "--proxy", help="Filtrar por PROXY_URL"),
     out_csv: str = typer.Option("data/metrics/summary.csv", "--out-csv", help="Caminho do CSV de saída"),
     out_json: str = typer.Option("data/metrics/summary.json", "--out-json", help="Caminho do JSON de saída"),
+    cache: bool = typer.Option(False, "--cache/--no-cache", help="Mantém um rollup ao lado do log e lê só os eventos novos"),
 ):
     """Exporta agregações para CSV/JSON (para gráficos/notebooks)."""
     from src.shopee_scraper.metrics import export_metrics
 
     try:
         csv_path, json_path = export_metrics(
-            Path(path), hours=hours, profile=profile, proxy=proxy, out_csv=Path(out_csv), out_json=Path(out_json)
+            Path(path),
+            hours=hours,
+            profile=profile,
+            proxy=proxy,
+            out_csv=Path(out_csv),
+            out_json=Path(out_json),
+            cache=cache,
         )
         console.print(f"[green]OK[/]: métricas exportadas → {csv_path}, {json_path}")
     except Exception as e:
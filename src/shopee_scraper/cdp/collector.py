@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import platform
+import queue
 import re
 import shlex
+import shutil
 import subprocess
+import threading
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Optional
 
@@ -26,7 +31,7 @@ except Exception:  # pragma: no cover
     pychrome = None  # defer import error to runtime message
 
 from ..config import settings
-from ..utils import ensure_data_dir, mark_session_status, current_profile_name, RateLimiter
+from ..utils import ensure_data_dir, mark_session_status, current_profile_name, RateLimiter, jitter_sleep
 from ..logs import log_event, configure_json_logging
 
 
@@ -105,27 +110,121 @@ def _build_launch_cmd(port: int) -> List[str]:
     return args
 
 
+@lru_cache(maxsize=16)
 def _accept_language_header(locale_code: str) -> str:
-    primary = locale_code
     base = locale_code.split("-")[0]
-    if base != primary:
-        return f"{primary},{base};q=0.9"
-    return f"{primary},{base};q=0.9"
+    if base == locale_code:
+        # No region subtag (e.g. "pt"): nothing to fall back to
+        return locale_code
+    return f"{locale_code},{base};q=0.9"
+
+
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+_REGEX_ESCAPED_CLASSES = frozenset("dDwWsSbBAZ0123456789")
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Longest literal run that every match of `pattern` must contain, if any.
+
+    Conservative: gives up on alternation and inline flags, ignores group/class
+    contents and drops characters made optional by a following quantifier.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return None
+    runs: List[str] = []
+    cur: List[str] = []
+    depth = 0
+    in_class = False
+    i = 0
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if in_class:
+            if ch == "\\":
+                i += 1
+            elif ch == "]":
+                in_class = False
+        elif ch == "\\" and i + 1 < n:
+            nxt = pattern[i + 1]
+            i += 1
+            if depth == 0 and nxt not in _REGEX_ESCAPED_CLASSES and not nxt.isalpha():
+                cur.append(nxt)
+            else:
+                runs.append("".join(cur))
+                cur = []
+        elif ch == "[":
+            in_class = True
+            runs.append("".join(cur))
+            cur = []
+        elif ch == "(":
+            depth += 1
+            runs.append("".join(cur))
+            cur = []
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        elif ch in "?*{":
+            # The preceding atom may be absent
+            if cur:
+                cur.pop()
+            runs.append("".join(cur))
+            cur = []
+            if ch == "{":
+                end = pattern.find("}", i)
+                i = end if end != -1 else n
+        elif ch in ".^$+":
+            runs.append("".join(cur))
+            cur = []
+        elif depth == 0:
+            cur.append(ch)
+        i += 1
+    runs.append("".join(cur))
+    best = max(runs, key=len)
+    return best if len(best) >= 3 else None
 
 
 @dataclass
 class CdpFilters:
     url_regexes: List[re.Pattern] = field(default_factory=list)
+    # Patterns without regex metacharacters (e.g. "/api/v4/pdp/get_pc") are plain
+    # substring checks; `in` is much cheaper than a regex search per network event.
+    literals: List[str] = field(default_factory=list)
+    # Per-regex mandatory substring (or None); URLs lacking it skip the regex entirely
+    regex_tokens: List[Optional[str]] = field(default_factory=list)
 
     @classmethod
     def from_patterns(cls, patterns: Iterable[str]) -> "CdpFilters":
-        return cls([re.compile(p) for p in patterns])
+        regexes: List[re.Pattern] = []
+        literals: List[str] = []
+        tokens: List[Optional[str]] = []
+        for p in patterns:
+            if _REGEX_META.isdisjoint(p):
+                literals.append(p)
+            else:
+                # URLs are ASCII; skip Unicode-aware character classes
+                regexes.append(re.compile(p, re.ASCII))
+                tokens.append(_required_literal(p))
+        return cls(regexes, literals, tokens)
 
     def match(self, url: str) -> bool:
-        return any(r.search(url) for r in self.url_regexes)
+        for lit in self.literals:
+            if lit in url:
+                return True
+        for r, token in zip(self.url_regexes, self.regex_tokens):
+            if token is not None and token not in url:
+                continue
+            if r.search(url):
+                return True
+        return False
 
 
-@dataclass
+_EVENT_QUEUE_SIZE = 4096
+# How long a listener blocks on a full event queue before logging that it is still waiting
+_ENQUEUE_WAIT_S = 5.0
+# A navigation is done once its matching responses are in and no new one started for this long
+_NAV_QUIET_S = 1.0
+
+
+@dataclass(slots=True)
 class CapturedItem:
     request_id: str
     url: str
@@ -133,6 +232,17 @@ class CapturedItem:
     headers: Dict[str, str]
     body: Optional[str] = None
     base64_encoded: bool = False
+    loader_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _NavProgress:
+    """Matching responses of one document load (CDP loaderId)."""
+
+    matched: int = 0
+    settled: int = 0  # bodies fetched or given up on
+    bodies: int = 0
+    last_change: float = 0.0  # time.monotonic()
 
 
 class CdpCollector:
@@ -150,89 +260,183 @@ class CdpCollector:
         self._last_match_ts: float = 0.0
         self._blocked_by_status: bool = False
         self._blocked_url_hit: Optional[str] = None
-        # Minimal counters for metrics
-        self._counters: Dict[str, int] = {
-            "navigate_attempts": 0,
-            "responses_matched": 0,
-            "blocked_status_hits": 0,
+        # Minimal counters for metrics (plain attributes: bumped from listener callbacks)
+        self._navigate_attempts: int = 0
+        self._responses_matched: int = 0
+        self._blocked_status_hits: int = 0
+        # Listener callbacks only enqueue; a worker does matching and body fetches
+        self._event_q: "queue.Queue" = queue.Queue(maxsize=_EVENT_QUEUE_SIZE)
+        self._navs: Dict[str, _NavProgress] = {}
+        self._drain_thread = threading.Thread(target=self._drain, name="cdp-events", daemon=True)
+        self._drain_thread.start()
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "navigate_attempts": self._navigate_attempts,
+            "responses_matched": self._responses_matched,
+            "blocked_status_hits": self._blocked_status_hits,
         }
 
+    # --------------- Event handoff (pychrome callback thread -> drain thread) ---------------
+    def _enqueue(self, handler: Callable, tab, kwargs: dict) -> None:
+        # pychrome calls listeners from its event thread, not the websocket reader: blocking
+        # here when the queue is full is backpressure, and no event (loadingFinished included) is lost
+        entry = (handler, tab, kwargs)
+        while True:
+            try:
+                self._event_q.put(entry, timeout=_ENQUEUE_WAIT_S)
+                return
+            except queue.Full:
+                if not self._drain_thread.is_alive():
+                    logger.warning(f"CDP event after close() not handled: {handler.__name__}")
+                    return
+                logger.warning(f"CDP event queue full for {_ENQUEUE_WAIT_S:.0f}s; waiting for the handler thread")
+
+    def _drain(self) -> None:
+        while True:
+            entry = self._event_q.get()
+            try:
+                if entry is None:
+                    return
+                handler, tab, kwargs = entry
+                handler(tab, kwargs)
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"CDP event handler failed: {e}")
+            finally:
+                self._event_q.task_done()
+
+    def drain(self) -> None:
+        """Block until every event received so far has been processed."""
+        self._event_q.join()
+
+    def close(self) -> None:
+        self._event_q.put(None)
+
+    def navigation_done(self, loader_id: Optional[str], quiet_s: float = _NAV_QUIET_S) -> bool:
+        """True once the load `loader_id` (from Page.navigate) captured a body, has no matching
+        response in flight and started none for `quiet_s`.
+
+        Responses of earlier loads in the same tab carry their own loaderId and never count.
+        """
+        nav = self._navs.get(loader_id) if loader_id else None
+        return (
+            nav is not None
+            and nav.bodies > 0
+            and nav.settled >= nav.matched
+            and time.monotonic() - nav.last_change >= quiet_s
+        )
+
+    def forget_navigation(self, loader_id: Optional[str]) -> None:
+        if loader_id:
+            self._navs.pop(loader_id, None)
+
+    def _on_request_will_be_sent(self, tab, kwargs: dict) -> None:
+        req = kwargs.get("request", {})
+        url = req.get("url", "")
+        request_id = kwargs.get("requestId")
+        now = time.time()
+        self._last_any_network_ts = now
+        if request_id and self.filters.match(url):
+            loader_id = kwargs.get("loaderId")
+            # A redirect re-sends the same requestId: it still finishes only once
+            if loader_id and request_id not in self._items:
+                nav = self._navs.get(loader_id)
+                if nav is None:
+                    nav = self._navs[loader_id] = _NavProgress()
+                nav.matched += 1
+                nav.last_change = time.monotonic()
+            self._items[request_id] = CapturedItem(
+                request_id=request_id,
+                url=url,
+                status=None,
+                headers={},
+                loader_id=loader_id,
+            )
+            # We consider a match signal as soon as we see a filtered request
+            self._last_match_ts = now
+            self._responses_matched += 1
+
+    def _on_response_received(self, tab, kwargs: dict) -> None:
+        request_id = kwargs.get("requestId")
+        response = kwargs.get("response", {})
+        self._last_any_network_ts = time.time()
+        item = self._items.get(request_id)
+        if item is not None:
+            item.status = response.get("status")
+            # normalize headers to str:str
+            hdrs = response.get("headers", {})
+            item.headers = {str(k): str(v) for k, v in hdrs.items()}
+            # Block signals on throttling/forbidden
+            try:
+                st = int(response.get("status") or 0)
+                if st in (403, 429):
+                    self._blocked_by_status = True
+                    self._blocked_status_hits += 1
+            except Exception:
+                pass
+
+    def _on_loading_finished(self, tab, kwargs: dict) -> None:
+        request_id = kwargs.get("requestId")
+        item = self._items.get(request_id)
+        if item is not None:
+            try:
+                # Backoff for transient errors while fetching body
+                for attempt in Retrying(
+                    stop=stop_after_attempt(3),
+                    wait=wait_exponential(multiplier=0.5, min=0.5, max=4) + wait_random(0, 0.5),
+                    retry=retry_if_exception_type(Exception),
+                    reraise=True,
+                ):
+                    with attempt:
+                        body_resp = tab.call_method("Network.getResponseBody", requestId=request_id)
+                item.body = body_resp.get("body")
+                item.base64_encoded = bool(body_resp.get("base64Encoded"))
+                self._last_match_ts = time.time()
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"Failed to get body for {request_id}: {e}")
+            nav = self._navs.get(item.loader_id) if item.loader_id else None
+            if nav is not None:
+                if item.body is not None:
+                    nav.bodies += 1
+                nav.last_change = time.monotonic()
+                nav.settled += 1
+
+    # Detect navigation to block pages (captcha/login)
+    def _on_frame_navigated(self, tab, kwargs: dict) -> None:
+        try:
+            frame = kwargs.get("frame", {})
+            url = frame.get("url", "")
+            if url:
+                self._last_any_network_ts = time.time()
+                patterns = [
+                    r"/verify/captcha",
+                    r"/portal/verification",
+                    r"/account/login",
+                    r"captcha",
+                    r"/user/login",
+                ]
+                for p in patterns:
+                    if re.search(p, url):
+                        self._blocked_url_hit = url
+                        break
+        except Exception:
+            pass
+
     def new_tab(self):
         tab = self.browser.new_tab()
 
+        # Listeners run on pychrome's websocket thread: hand off and return immediately
         def on_request_will_be_sent(**kwargs):
-            req = kwargs.get("request", {})
-            url = req.get("url", "")
-            request_id = kwargs.get("requestId")
-            self._last_any_network_ts = time.time()
-            if request_id and self.filters.match(url):
-                self._items[request_id] = CapturedItem(
-                    request_id=request_id,
-                    url=url,
-                    status=None,
-                    headers={},
-                )
-                # We consider a match signal as soon as we see a filtered request
-                self._last_match_ts = time.time()
-                self._counters["responses_matched"] += 1
+            self._enqueue(self._on_request_will_be_sent, tab, kwargs)
 
         def on_response_received(**kwargs):
-            request_id = kwargs.get("requestId")
-            response = kwargs.get("response", {})
-            self._last_any_network_ts = time.time()
-            if request_id in self._items:
-                self._items[request_id].status = response.get("status")
-                # normalize headers to str:str
-                hdrs = response.get("headers", {})
-                self._items[request_id].headers = {str(k): str(v) for k, v in hdrs.items()}
-                # Block signals on throttling/forbidden
-                try:
-                    st = int(response.get("status") or 0)
-                    if st in (403, 429):
-                        self._blocked_by_status = True
-                        self._counters["blocked_status_hits"] += 1
-                except Exception:
-                    pass
+            self._enqueue(self._on_response_received, tab, kwargs)
 
         def on_loading_finished(**kwargs):
-            request_id = kwargs.get("requestId")
-            if request_id in self._items:
-                try:
-                    # Backoff for transient errors while fetching body
-                    for attempt in Retrying(
-                        stop=stop_after_attempt(3),
-                        wait=wait_exponential(multiplier=0.5, min=0.5, max=4) + wait_random(0, 0.5),
-                        retry=retry_if_exception_type(Exception),
-                        reraise=True,
-                    ):
-                        with attempt:
-                            body_resp = tab.call_method("Network.getResponseBody", requestId=request_id)
-                    self._items[request_id].body = body_resp.get("body")
-                    self._items[request_id].base64_encoded = bool(body_resp.get("base64Encoded"))
-                    self._last_match_ts = time.time()
-                except Exception as e:  # pragma: no cover
-                    logger.warning(f"Failed to get body for {request_id}: {e}")
-
-        # Detect navigation to block pages (captcha/login)
+            self._enqueue(self._on_loading_finished, tab, kwargs)
+
         def on_frame_navigated(**kwargs):
-            try:
-                frame = kwargs.get("frame", {})
-                url = frame.get("url", "")
-                if url:
-                    self._last_any_network_ts = time.time()
-                    patterns = [
-                        r"/verify/captcha",
-                        r"/portal/verification",
-                        r"/account/login",
-                        r"captcha",
-                        r"/user/login",
-                    ]
-                    for p in patterns:
-                        if re.search(p, url):
-                            self._blocked_url_hit = url
-                            break
-            except Exception:
-                pass
+            self._enqueue(self._on_frame_navigated, tab, kwargs)
 
         tab.set_listener("Network.requestWillBeSent", on_request_will_be_sent)
         tab.set_listener("Network.responseReceived", on_response_received)
@@ -284,6 +488,7 @@ class CdpCollector:
         return None
 
     def dump_items_jsonl(self, path: Path) -> int:
+        self.drain()
         count = 0
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w", encoding="utf-8") as f:
@@ -309,8 +514,8 @@ def start_chrome_if_requested(port: int, launch: bool) -> Optional[subprocess.Po
     # Wait for DevTools endpoint to be ready
     import urllib.request as _u
     import socket as _s
-    start = time.time()
-    while time.time() - start < 20.0:
+    deadline = time.monotonic() + 20.0
+    while time.monotonic() < deadline:
         try:
             with _u.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1.5) as resp:
                 if resp.status == 200:
@@ -321,6 +526,81 @@ def start_chrome_if_requested(port: int, launch: bool) -> Optional[subprocess.Po
     return proc
 
 
+@dataclass
+class _SharedChrome:
+    proc: subprocess.Popen
+    refs: int = 0
+
+
+_chrome_lock = threading.Lock()
+_chrome_singleton: Dict[int, _SharedChrome] = {}
+
+
+class ChromeHandle:
+    """Refcounted Chrome process shared by the collect_* helpers (one per debug port).
+
+    The last user to release the handle terminates Chrome, unless `reuse` is on
+    (CDP_REUSE_CHROME), in which case the process is kept for the next helper in
+    this Python process and terminated at exit.
+    """
+
+    def __init__(self, port: int, launch: bool, *, reuse: Optional[bool] = None) -> None:
+        self.port = port
+        self.launch = launch
+        self.reuse = settings.cdp_reuse_chrome if reuse is None else reuse
+        self._held = False
+
+    def acquire(self) -> "ChromeHandle":
+        if not self.launch or self._held:
+            return self
+        with _chrome_lock:
+            shared = _chrome_singleton.get(self.port)
+            if shared is None or shared.proc.poll() is not None:
+                proc = start_chrome_if_requested(self.port, launch=True)
+                shared = _SharedChrome(proc=proc)
+                _chrome_singleton[self.port] = shared
+            else:
+                logger.info(f"Reusing Chrome on port {self.port} (pid={shared.proc.pid})")
+            shared.refs += 1
+            self._held = True
+        return self
+
+    def release(self) -> None:
+        if not self._held:
+            return
+        with _chrome_lock:
+            self._held = False
+            shared = _chrome_singleton.get(self.port)
+            if shared is None:
+                return
+            shared.refs = max(0, shared.refs - 1)
+            if shared.refs == 0 and not self.reuse:
+                _chrome_singleton.pop(self.port, None)
+                _terminate_quietly(shared.proc)
+
+    def __enter__(self) -> "ChromeHandle":
+        return self.acquire()
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def _terminate_quietly(proc: Optional[subprocess.Popen]) -> None:
+    try:
+        if proc is not None:
+            proc.terminate()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _shutdown_shared_chrome() -> None:
+    with _chrome_lock:
+        for shared in _chrome_singleton.values():
+            _terminate_quietly(shared.proc)
+        _chrome_singleton.clear()
+
+
 def collect_pdp_once(url: str, launch: bool = False, timeout_s: float = 20.0) -> Path:
     """Launch/attach to Chrome via CDP, navigate to PDP, capture matching API responses.
 
@@ -333,7 +613,7 @@ def collect_pdp_once(url: str, launch: bool = False, timeout_s: float = 20.0) ->
     patterns = [p.strip() for p in env_patterns.split(",") if p.strip()] if env_patterns else default_patterns
 
     filters = CdpFilters.from_patterns(patterns)
-    proc = start_chrome_if_requested(port, launch)
+    chrome = ChromeHandle(port, launch).acquire()
     try:
         configure_json_logging()
         collector = CdpCollector(port=port, filters=filters)
@@ -349,14 +629,15 @@ def collect_pdp_once(url: str, launch: bool = False, timeout_s: float = 20.0) ->
         ):
             with attempt:
                 tab.call_method("Page.navigate", url=url)
-                collector._counters["navigate_attempts"] += 1
+                collector._navigate_attempts += 1
 
         # Simple dwell until timeout
-        session_t0 = time.time()
-        t0 = session_t0
-        while time.time() - t0 < timeout_s:
+        session_t0 = time.monotonic()
+        deadline = session_t0 + timeout_s
+        cb_after = session_t0 + 3.0
+        while (now := time.monotonic()) < deadline:
             time.sleep(0.25)
-            if (time.time() - t0) > 3.0:
+            if now > cb_after:
                 reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                 if reason:
                     log_event("circuit_trip", context="pdp_once", reason=reason)
@@ -384,8 +665,8 @@ def collect_pdp_once(url: str, launch: bool = False, timeout_s: float = 20.0) ->
             "cdp_capture_summary",
             context="pdp_once",
             captured=n,
-            duration_s=round(time.time() - session_t0, 3),
-            counters=collector._counters,
+            duration_s=round(time.monotonic() - session_t0, 3),
+            counters=collector.counters(),
             output=str(out_path),
         )
         if n <= 0:
@@ -405,11 +686,9 @@ def collect_pdp_once(url: str, launch: bool = False, timeout_s: float = 20.0) ->
                 tab.stop()
         except Exception:
             pass
-        try:
-            if proc is not None:
-                proc.terminate()
-        except Exception:
-            pass
+        if 'collector' in locals():
+            collector.close()
+        chrome.release()
 
 
 def collect_search_once(keyword: str, launch: bool = False, timeout_s: float = 20.0) -> Path:
@@ -430,7 +709,7 @@ def collect_search_once(keyword: str, launch: bool = False, timeout_s: float = 2
     patterns = [p.strip() for p in env_patterns.split(",") if p.strip()] if env_patterns else default_patterns
 
     filters = CdpFilters.from_patterns(patterns)
-    proc = start_chrome_if_requested(port, launch)
+    chrome = ChromeHandle(port, launch).acquire()
     try:
         configure_json_logging()
         collector = CdpCollector(port=port, filters=filters)
@@ -448,11 +727,12 @@ def collect_search_once(keyword: str, launch: bool = False, timeout_s: float = 2
             with attempt:
                 tab.call_method("Page.navigate", url=search_url)
 
-        session_t0 = time.time()
-        t0 = session_t0
-        while time.time() - t0 < timeout_s:
+        session_t0 = time.monotonic()
+        deadline = session_t0 + timeout_s
+        cb_after = session_t0 + 3.0
+        while (now := time.monotonic()) < deadline:
             time.sleep(0.25)
-            if (time.time() - t0) > 3.0:
+            if now > cb_after:
                 reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                 if reason:
                     log_event("circuit_trip", context="search_once", reason=reason)
@@ -479,8 +759,8 @@ def collect_search_once(keyword: str, launch: bool = False, timeout_s: float = 2
             "cdp_capture_summary",
             context="search_once",
             captured=n,
-            duration_s=round(time.time() - session_t0, 3),
-            counters=collector._counters,
+            duration_s=round(time.monotonic() - session_t0, 3),
+            counters=collector.counters(),
             output=str(out_path),
         )
         if n <= 0:
@@ -500,11 +780,9 @@ def collect_search_once(keyword: str, launch: bool = False, timeout_s: float = 2
                 tab.stop()
         except Exception:
             pass
-        try:
-            if proc is not None:
-                proc.terminate()
-        except Exception:
-            pass
+        if 'collector' in locals():
+            collector.close()
+        chrome.release()
 
 
 def collect_search_paged(
@@ -539,13 +817,13 @@ def collect_search_paged(
 
     q = _url.quote_plus(keyword)
 
-    proc = start_chrome_if_requested(port, launch)
+    chrome = ChromeHandle(port, launch).acquire()
     try:
         configure_json_logging()
         collector = CdpCollector(port=port, filters=filters)
         tab = collector.new_tab()
         total_pages = pages
-        session_t0 = time.time()
+        session_t0 = time.monotonic()
         for idx in range(start_page, start_page + pages):
             limiter.acquire()
             search_url = f"https://{settings.shopee_domain}/search?keyword={q}&page={idx}"
@@ -558,11 +836,13 @@ def collect_search_paged(
             ):
                 with attempt:
                     tab.call_method("Page.navigate", url=search_url)
-                    collector._counters["navigate_attempts"] += 1
-            t0 = time.time()
-            while time.time() - t0 < timeout_s:
+                    collector._navigate_attempts += 1
+            t0 = time.monotonic()
+            deadline = t0 + timeout_s
+            cb_after = t0 + 3.0
+            while (now := time.monotonic()) < deadline:
                 time.sleep(0.25)
-                if (time.time() - t0) > 3.0:
+                if now > cb_after:
                     reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                     if reason:
                         log_event("circuit_trip", context="search_paged", reason=reason, page=idx)
@@ -591,8 +871,8 @@ def collect_search_paged(
             context="search_paged",
             captured=n,
             pages=total_pages,
-            duration_s=round(time.time() - session_t0, 3),
-            counters=collector._counters,
+            duration_s=round(time.monotonic() - session_t0, 3),
+            counters=collector.counters(),
             output=str(out_path),
         )
         if n <= 0:
@@ -612,11 +892,9 @@ def collect_search_paged(
                 tab.stop()
         except Exception:
             pass
-        try:
-            if proc is not None:
-                proc.terminate()
-        except Exception:
-            pass
+        if 'collector' in locals():
+            collector.close()
+        chrome.release()
 
 
 def collect_search_all(
@@ -655,14 +933,14 @@ def collect_search_all(
 
     q = _url.quote_plus(keyword)
 
-    proc = start_chrome_if_requested(port, launch)
+    chrome = ChromeHandle(port, launch).acquire()
     try:
         configure_json_logging()
         collector = CdpCollector(port=port, filters=filters)
         tab = collector.new_tab()
         pages_visited = 0
         empty_streak = 0
-        session_t0 = time.time()
+        session_t0 = time.monotonic()
         for page_idx in range(start_page, start_page + max_pages):
             limiter.acquire()
             before = len(collector._items)
@@ -676,11 +954,13 @@ def collect_search_all(
             ):
                 with attempt:
                     tab.call_method("Page.navigate", url=search_url)
-                    collector._counters["navigate_attempts"] += 1
-            t0 = time.time()
-            while time.time() - t0 < timeout_s:
+                    collector._navigate_attempts += 1
+            t0 = time.monotonic()
+            deadline = t0 + timeout_s
+            cb_after = t0 + 3.0
+            while (now := time.monotonic()) < deadline:
                 time.sleep(0.25)
-                if (time.time() - t0) > 3.0:
+                if now > cb_after:
                     reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                     if reason:
                         log_event("circuit_trip", context="search_all", reason=reason, page=page_idx)
@@ -699,6 +979,7 @@ def collect_search_all(
                             break
             time.sleep(max(0.0, pause_s))
 
+            collector.drain()
             after = len(collector._items)
             delta = max(0, after - before)
             pages_visited += 1
@@ -721,8 +1002,8 @@ def collect_search_all(
             context="search_all",
             captured=n,
             pages=pages_visited,
-            duration_s=round(time.time() - session_t0, 3),
-            counters=collector._counters,
+            duration_s=round(time.monotonic() - session_t0, 3),
+            counters=collector.counters(),
             output=str(out_path),
         )
         if n <= 0:
@@ -742,11 +1023,9 @@ def collect_search_all(
                 tab.stop()
         except Exception:
             pass
-        try:
-            if proc is not None:
-                proc.terminate()
-        except Exception:
-            pass
+        if 'collector' in locals():
+            collector.close()
+        chrome.release()
 
 
 def launch_chrome_for_login(timeout_open_s: Optional[float] = None, port: Optional[int] = None) -> None:
@@ -775,6 +1054,53 @@ def launch_chrome_for_login(timeout_open_s: Optional[float] = None, port: Option
 from typing import Callable, Optional
 
 
+_MERGE_BUFSIZE = 1 << 20
+
+
+# Kernel-side file->file copies: Linux sendfile accepts a regular file as the output fd
+# (macOS/BSD only send to sockets, so they take the buffered copy below)
+_HAS_FILE_SENDFILE = hasattr(os, "sendfile") and platform.system() == "Linux"
+
+
+def _sendfile_all(out_fd: int, in_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+        if sent == 0:  # source shrank underneath us
+            break
+        offset += sent
+
+
+def _merge_jsonl_files(chunk_paths: List[Path], final_out: Path) -> None:
+    """Concatenate per-session JSONL chunks into `final_out` as a raw byte copy.
+
+    Uses os.sendfile on Linux (no userspace buffer), otherwise a buffered copyfileobj.
+    """
+    if _HAS_FILE_SENDFILE:
+        with final_out.open("wb", buffering=0) as out:
+            out_fd = out.fileno()
+            for pth in chunk_paths:
+                with pth.open("rb", buffering=0) as src:
+                    in_fd = src.fileno()
+                    size = os.fstat(in_fd).st_size
+                    if size == 0:
+                        continue
+                    _sendfile_all(out_fd, in_fd, size)
+                    # Keep records line-delimited even if a chunk lacks its final newline
+                    if os.pread(in_fd, 1, size - 1) != b"\n":
+                        out.write(b"\n")
+        return
+
+    with final_out.open("wb", buffering=_MERGE_BUFSIZE) as out:
+        for pth in chunk_paths:
+            with pth.open("rb", buffering=_MERGE_BUFSIZE) as src:
+                shutil.copyfileobj(src, out, length=_MERGE_BUFSIZE)
+                if src.tell() > 0:
+                    src.seek(-1, os.SEEK_END)
+                    if src.read(1) != b"\n":
+                        out.write(b"\n")
+
+
 def collect_pdp_batch(
     urls: List[str],
     launch: bool = False,
@@ -797,15 +1123,15 @@ def collect_pdp_batch(
     filters = CdpFilters.from_patterns(patterns)
 
     # Helper to run a single session over a subset of URLs
-    def _run_once(sub: List[str]) -> Path:
+    def _run_once(sub: List[str], reuse: Optional[bool] = None) -> Path:
         limiter = RateLimiter(settings.requests_per_minute)
-        proc = start_chrome_if_requested(port, launch)
+        chrome = ChromeHandle(port, launch, reuse=reuse).acquire()
         try:
             configure_json_logging()
             collector = CdpCollector(port=port, filters=filters)
             tab = collector.new_tab()
             total = len(sub)
-            session_t0 = time.time()
+            session_t0 = time.monotonic()
             for i, u in enumerate(sub, start=1):
                 try:
                     limiter.acquire()
@@ -821,14 +1147,16 @@ def collect_pdp_batch(
                     ):
                         with attempt:
                             tab.call_method("Page.navigate", url=u)
-                            collector._counters["navigate_attempts"] += 1
+                            collector._navigate_attempts += 1
                 except Exception as e:
                     logger.warning(f"Failed to navigate to {u}: {e}")
                     continue
-                t0 = time.time()
-                while time.time() - t0 < timeout_s:
+                t0 = time.monotonic()
+                deadline = t0 + timeout_s
+                cb_after = t0 + 3.0
+                while (now := time.monotonic()) < deadline:
                     time.sleep(0.25)
-                    if (time.time() - t0) > 3.0:
+                    if now > cb_after:
                         reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                         if reason:
                             log_event("circuit_trip", context="pdp_batch", reason=reason, index=i)
@@ -857,8 +1185,8 @@ def collect_pdp_batch(
                 "cdp_capture_summary",
                 context="pdp_batch",
                 captured=n,
-                duration_s=round(time.time() - session_t0, 3),
-                counters=collector._counters,
+                duration_s=round(time.monotonic() - session_t0, 3),
+                counters=collector.counters(),
                 output=str(out_path),
             )
             if n <= 0:
@@ -878,11 +1206,9 @@ def collect_pdp_batch(
                     tab.stop()
             except Exception:
                 pass
-            try:
-                if proc is not None:
-                    proc.terminate()
-            except Exception:
-                pass
+            if 'collector' in locals():
+                collector.close()
+            chrome.release()
 
     pages_per_session = max(0, int(settings.pages_per_session))
     if launch and pages_per_session and len(urls) > pages_per_session:
@@ -890,18 +1216,16 @@ def collect_pdp_batch(
         chunk_paths: List[Path] = []
         for i in range(0, len(urls), pages_per_session):
             sub = urls[i : i + pages_per_session]
-            chunk_paths.append(_run_once(sub))
+            # Each chunk is its own Chrome session (rotation), so never keep it alive
+            chunk_paths.append(_run_once(sub, reuse=False))
             # Cooldown between Chrome sessions to reduce reconnection patterns
             if i + pages_per_session < len(urls):
-                from ..utils import jitter_sleep
                 jitter_sleep(2.0, 5.0)
         # Concatenate JSONL files
         data_dir = ensure_data_dir()
         ts = int(time.time())
         final_out = data_dir / f"cdp_pdp_batch_{ts}.jsonl"
-        with final_out.open("w", encoding="utf-8") as out:
-            for pth in chunk_paths:
-                out.write(pth.read_text(encoding="utf-8"))
+        _merge_jsonl_files(chunk_paths, final_out)
         return final_out
     else:
         return _run_once(urls)
@@ -918,8 +1242,9 @@ def collect_pdp_batch_concurrent(
 ) -> Path:
     """Capture PDP API responses for multiple product URLs using multiple tabs concurrently.
 
-    Schedules navigation in batches of size `concurrency`, staggering each tab by `stagger_s` seconds,
-    and waiting `timeout_s` after dispatching a batch.
+    Schedules navigation in batches of size `concurrency`, staggering each tab by `stagger_s` seconds.
+    Each tab then gets up to `timeout_s` to capture the matching responses of its navigation
+    (all of them, then a short quiet period); the batch ends once every tab is done or timed out.
     """
     if not urls:
         raise ValueError("No URLs provided for PDP batch capture.")
@@ -934,8 +1259,10 @@ def collect_pdp_batch_concurrent(
     filters = CdpFilters.from_patterns(patterns)
     limiter = RateLimiter(settings.requests_per_minute)
 
-    def _run_chunk(chunk_urls: List[str], chunk_index: int, total_chunks: int) -> Path:
-        proc = start_chrome_if_requested(port, launch)
+    def _run_chunk(
+        chunk_urls: List[str], chunk_index: int, total_chunks: int, reuse: Optional[bool] = None
+    ) -> Path:
+        chrome = ChromeHandle(port, launch, reuse=reuse).acquire()
         tabs: List = []
         try:
             configure_json_logging()
@@ -945,10 +1272,12 @@ def collect_pdp_batch_concurrent(
             for _ in range(tabs_count):
                 tabs.append(collector.new_tab())
             total = len(chunk_urls)
-            session_t0 = time.time()
+            session_t0 = time.monotonic()
             for i in range(0, len(chunk_urls), len(tabs)):
                 batch = chunk_urls[i : i + len(tabs)]
                 logger.info(f"Chunk {chunk_index}/{total_chunks} → dispatch {len(batch)}")
+                # Per-tab completion: (loaderId of its navigation, own deadline) for every dispatched tab
+                pending: List = []
                 for j, u in enumerate(batch):
                     try:
                         limiter.acquire()
@@ -971,18 +1300,24 @@ def collect_pdp_batch_concurrent(
                             reraise=True,
                         ):
                             with attempt:
-                                tabs[j].call_method("Page.navigate", url=u)
-                                collector._counters["navigate_attempts"] += 1
+                                nav_resp = tabs[j].call_method("Page.navigate", url=u)
+                                collector._navigate_attempts += 1
+                        # Without a loaderId (failed navigation) the tab simply runs to its deadline
+                        loader_id = nav_resp.get("loaderId") if isinstance(nav_resp, dict) else None
+                        pending.append((loader_id, time.monotonic() + timeout_s + 0.5))
                     except Exception as e:
                         logger.warning(f"Failed to navigate tab {j+1} to {u}: {e}")
                     time.sleep(max(0.0, stagger_s))
-                # Wait enough for the last dispatched tab to have ~timeout_s to work
-                dispatch_span = max(0.0, (len(batch) - 1) * max(0.0, stagger_s))
-                wait_target = timeout_s + dispatch_span + 0.5
-                t0 = time.time()
-                while time.time() - t0 < wait_target:
+                # Each tab waits until its navigation's matching responses are in or its own
+                # timeout_s elapses, so a batch costs its slowest tab rather than a blanket wait
+                t0 = time.monotonic()
+                deadline = max((dl for _, dl in pending), default=t0)
+                cb_after = t0 + 3.0
+                while (now := time.monotonic()) < deadline:
+                    if all(now >= dl or collector.navigation_done(lid) for lid, dl in pending):
+                        break
                     time.sleep(0.25)
-                    if (time.time() - t0) > 3.0:
+                    if now > cb_after:
                         reason = collector.should_trip_circuit(inactivity_s=settings.cdp_inactivity_s)
                         if reason:
                             log_event(
@@ -1004,6 +1339,8 @@ def collect_pdp_batch_concurrent(
                             else:
                                 logger.warning(f"Circuit signal ignored (soft mode): {reason}")
                                 break
+                for lid, _ in pending:
+                    collector.forget_navigation(lid)
                 if on_progress:
                     on_progress(
                         "batch_done",
@@ -1021,8 +1358,8 @@ def collect_pdp_batch_concurrent(
                 "cdp_capture_summary",
                 context="pdp_batch_concurrent",
                 captured=n,
-                duration_s=round(time.time() - session_t0, 3),
-                counters=collector._counters,
+                duration_s=round(time.monotonic() - session_t0, 3),
+                counters=collector.counters(),
                 output=str(out_path),
             )
             if n <= 0:
@@ -1042,29 +1379,27 @@ def collect_pdp_batch_concurrent(
                     t.stop()
                 except Exception:
                     pass
-            try:
-                if proc is not None:
-                    proc.terminate()
-            except Exception:
-                pass
+            if 'collector' in locals():
+                collector.close()
+            chrome.release()
 
     pages_per_session = max(0, int(settings.pages_per_session))
     if launch and pages_per_session and len(urls) > pages_per_session:
         chunk_paths: List[Path] = []
         total_chunks = (len(urls) + pages_per_session - 1) // pages_per_session
+        # Chunks run strictly one after another: every session launches Chrome on the same
+        # CDP_PORT and USER_DATA_DIR (the logged-in profile), and Chrome refuses a second
+        # instance on a locked profile. Parallelism lives inside a chunk (tabs), not across them.
         for cidx, start in enumerate(range(0, len(urls), pages_per_session), start=1):
             chunk = urls[start : start + pages_per_session]
-            chunk_paths.append(_run_chunk(chunk, cidx, total_chunks))
+            chunk_paths.append(_run_chunk(chunk, cidx, total_chunks, reuse=False))
             # Cooldown between Chrome sessions
             if start + pages_per_session < len(urls):
-                from ..utils import jitter_sleep
                 jitter_sleep(2.0, 5.0)
         data_dir = ensure_data_dir()
         ts = int(time.time())
         final_out = data_dir / f"cdp_pdp_batch_{ts}.jsonl"
-        with final_out.open("w", encoding="utf-8") as out:
-            for pth in chunk_paths:
-                out.write(pth.read_text(encoding="utf-8"))
+        _merge_jsonl_files(chunk_paths, final_out)
         return final_out
     else:
         return _run_chunk(urls, 1, 1)
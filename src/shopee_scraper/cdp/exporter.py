@@ -1,45 +1,98 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from loguru import logger
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # stdlib json fallback
+
 from ..utils import ensure_data_dir, write_csv, write_json
-from ..schemas import SearchItem, PdpItem, deduplicate_models
+from ..schemas import SearchItem, PdpItem
 from ..config import settings
 
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# CSV headers of the exports: every row is a dumped model, so the columns are known up front
+PDP_FIELDS: Tuple[str, ...] = tuple(sorted(PdpItem.model_fields))
+SEARCH_FIELDS: Tuple[str, ...] = tuple(sorted(SearchItem.model_fields))
+
+
 def _loads_body(body: str, base64_flag: bool) -> Optional[dict]:
     try:
-        if base64_flag:
-            raw = base64.b64decode(body)
-            text = raw.decode("utf-8", errors="replace")
-        else:
-            text = body
-        return json.loads(text)
+        # Both parsers accept UTF-8 bytes, so the decoded payload is parsed without a str copy
+        return _json_loads(base64.b64decode(body) if base64_flag else body)
     except Exception as e:
         logger.warning(f"Failed to parse body JSON: {e}")
         return None
 
 
-def _safe_get(d: dict, path: Iterable[str], default=None):
-    cur: Any = d
-    for key in path:
-        if not isinstance(cur, dict):
-            return default
-        cur = cur.get(key)
-        if cur is None:
-            return default
-    return cur
+class CaptureRecord(NamedTuple):
+    """The fields of a CDP JSONL record the exporters read (``headers`` is ignored)."""
+
+    body: Optional[str]
+    base64: bool
+    url: Optional[str]
+    status: Optional[int]
+
+
+_RECORD_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)  # orjson's error subclasses JSONDecodeError
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _decode_record(line: bytes) -> CaptureRecord:
+    # Lenient like the rest of the exporter: odd field types are kept and checked where used
+    rec = _json_loads(line)
+    get = rec.get
+    return CaptureRecord(get("body"), bool(get("base64")), get("url"), get("status"))
+
+
+def _iter_capture_records(jsonl_path: Path) -> Iterator[CaptureRecord]:
+    """Yield the records of a CDP JSONL capture, skipping blank, non-object and invalid lines.
+
+    Reads raw bytes through a 64 KiB buffer and hands each line to the parser
+    without decoding it to str first.
+    """
+    with jsonl_path.open("rb", buffering=1 << 16) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(_UTF8_BOM):  # capture saved as utf-8-sig
+                line = line[3:].lstrip()
+            # Records are JSON objects: skip blank/non-object lines without entering the parser
+            if not line or line[0] != 0x7B:  # b"{"
+                continue
+            try:
+                rec = _decode_record(line)
+            except _RECORD_ERRORS as e:
+                logger.warning(
+                    f"Skipping invalid JSONL line: {e}\n{line[:200].decode('utf-8', errors='replace')}"
+                )
+                continue
+            yield rec
+
+
+def _body_key(body: str, base64_flag: bool) -> Tuple[bytes, bool]:
+    # A digest rather than the body: the repeat check must not hold every captured payload in memory
+    return hashlib.sha1(body.encode("utf-8", "surrogatepass")).digest(), base64_flag
+
 
+def _get2(d: dict, k1: str, k2: str) -> Any:
+    """d[k1][k2] when d[k1] is a dict, else None (fixed two-level path, no list walk)."""
+    v = d.get(k1)
+    return v.get(k2) if type(v) is dict else None
 
-def _normalize_price(item: dict) -> Tuple[Optional[int], Optional[int]]:
+
+def _normalize_price(item: dict, product_price: Any) -> Tuple[Optional[int], Optional[int]]:
     # Try product_price.price.single_value
-    single = _safe_get(item, ["product_price", "price", "single_value"], None)
+    single = _get2(product_price, "price", "single_value") if type(product_price) is dict else None
     if isinstance(single, int):
         return single, single
     # Try price_min/price_max
@@ -66,24 +119,23 @@ def normalize_pdp_record(body_json: dict, page_url: str, status: Optional[int])
     if not isinstance(item, dict):
         return None
 
-    item_id = item.get("item_id")
-    shop_id = item.get("shop_id")
-    title = item.get("title")
-    currency = item.get("currency")
-    rating = _safe_get(item, ["item_rating", "rating_star"], None)
-    shop_location = item.get("shop_location")
-    categories = item.get("categories")
+    item_get = item.get
+    item_id = item_get("item_id")
+    shop_id = item_get("shop_id")
+    title = item_get("title")
+    currency = item_get("currency")
+    rating = _get2(item, "item_rating", "rating_star")
+    shop_location = item_get("shop_location")
+    categories = item_get("categories")
     cat_path = None
     if isinstance(categories, list):
         names = [c.get("display_name") for c in categories if isinstance(c, dict) and c.get("display_name")]
         if names:
             cat_path = " > ".join(names)
-    images = _safe_get(item, ["product_images", "images"], [])
-    if not isinstance(images, list):
-        images = []
-    first_image = images[0] if images else None
+    images = _get2(item, "product_images", "images")
+    first_image = images[0] if isinstance(images, list) and images else None
 
-    price_min, price_max = _normalize_price(item)
+    price_min, price_max = _normalize_price(item, item_get("product_price"))
 
     try:
         return PdpItem(
@@ -110,42 +162,43 @@ def export_pdp_from_jsonl(jsonl_path: Path) -> Tuple[Path, Path, List[Dict[str,
 
     Returns (json_out_path, csv_out_path, rows)
     """
-    models: List[PdpItem] = []
-    with jsonl_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rec = json.loads(line)
-            except Exception as e:
-                logger.warning(f"Skipping invalid JSONL line: {e}\n{line[:200]}")
-                continue
-            body = rec.get("body")
-            base64_flag = bool(rec.get("base64"))
-            page_url = rec.get("url")
-            status = rec.get("status")
-            if not isinstance(body, str):
-                continue
-            parsed = _loads_body(body, base64_flag)
-            if not parsed:
-                continue
-            row_model = normalize_pdp_record(parsed, page_url=page_url, status=status)
-            if row_model:
-                models.append(row_model)
-
-    # Deduplicate by (shop_id, item_id)
-    models = deduplicate_models(models)
-
-    # Serialize to rows
-    rows: List[Dict[str, Any]] = [m.model_dump() for m in models]
+    # Deduplicate by (shop_id, item_id) and dump to a row in the same pass; keyless rows are always kept
+    rows: List[Dict[str, Any]] = []
+    seen: Set[Tuple[int, int]] = set()
+    # Retried navigations re-capture identical payloads: a repeat is not decoded/parsed again.
+    # Its keyed rows are duplicates by then, so only the keyless rows it produced are re-emitted
+    keyless_by_body: Dict[Tuple[bytes, bool], List[Dict[str, Any]]] = {}
+    for rec in _iter_capture_records(jsonl_path):
+        body = rec.body
+        if not isinstance(body, str):
+            continue
+        body_key = _body_key(body, rec.base64)
+        repeat = keyless_by_body.get(body_key)
+        if repeat is not None:
+            rows.extend(dict(r) for r in repeat)
+            continue
+        keyless = keyless_by_body[body_key] = []
+        parsed = _loads_body(body, rec.base64)
+        if not parsed:
+            continue
+        row_model = normalize_pdp_record(parsed, page_url=rec.url, status=rec.status)
+        if row_model:
+            k = row_model.key()
+            if k is not None:
+                if k in seen:
+                    continue
+                seen.add(k)
+            row = row_model.model_dump()
+            if k is None:
+                keyless.append(row)
+            rows.append(row)
 
     data_dir = ensure_data_dir()
     stem = jsonl_path.stem  # e.g., cdp_pdp_12345
     json_out = data_dir / f"{stem}_export.json"
     csv_out = data_dir / f"{stem}_export.csv"
     write_json(rows, json_out)
-    write_csv(rows, csv_out)
+    write_csv(rows, csv_out, fieldnames=PDP_FIELDS)
     return json_out, csv_out, rows
 
 
@@ -166,7 +219,11 @@ def _find_search_items(payload: Any) -> List[dict]:
     return []
 
 
-def _normalize_search_item(entry: dict) -> SearchItem:
+def _product_url_prefix() -> str:
+    return f"https://{settings.shopee_domain}/product/"
+
+
+def _normalize_search_item(entry: dict, product_url_prefix: Optional[str] = None) -> SearchItem:
     base = entry.get("item_basic") if isinstance(entry.get("item_basic"), dict) else entry
     item_id = base.get("itemid") or base.get("item_id")
     shop_id = base.get("shopid") or base.get("shop_id")
@@ -179,7 +236,7 @@ def _normalize_search_item(entry: dict) -> SearchItem:
 
     url = None
     if shop_id and item_id:
-        url = f"https://{settings.shopee_domain}/product/{shop_id}/{item_id}"
+        url = f"{product_url_prefix or _product_url_prefix()}{shop_id}/{item_id}"
 
     return SearchItem(
         item_id=item_id,
@@ -195,40 +252,45 @@ def _normalize_search_item(entry: dict) -> SearchItem:
 
 
 def export_search_from_jsonl(jsonl_path: Path) -> Tuple[Path, Path, List[Dict[str, Any]]]:
-    models: List[SearchItem] = []
-    with jsonl_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+    rows: List[Dict[str, Any]] = []
+    seen: Set[Tuple[int, int]] = set()
+    # Read the (pydantic) settings attribute once per export, not once per item
+    url_prefix = _product_url_prefix()
+    keyless_by_body: Dict[Tuple[bytes, bool], List[Dict[str, Any]]] = {}
+    for rec in _iter_capture_records(jsonl_path):
+        body = rec.body
+        if not isinstance(body, str):
+            continue
+        body_key = _body_key(body, rec.base64)
+        repeat = keyless_by_body.get(body_key)
+        if repeat is not None:
+            rows.extend(dict(r) for r in repeat)
+            continue
+        keyless = keyless_by_body[body_key] = []
+        parsed = _loads_body(body, rec.base64)
+        if not parsed:
+            continue
+        items = _find_search_items(parsed)
+        for it in items:
             try:
-                rec = json.loads(line)
+                row_model = _normalize_search_item(it, url_prefix)
             except Exception as e:
-                logger.warning(f"Skipping invalid JSONL line: {e}\n{line[:200]}")
-                continue
-            body = rec.get("body")
-            base64_flag = bool(rec.get("base64"))
-            if not isinstance(body, str):
-                continue
-            parsed = _loads_body(body, base64_flag)
-            if not parsed:
+                logger.warning(f"Skipping invalid search item: {e}")
                 continue
-            items = _find_search_items(parsed)
-            for it in items:
-                try:
-                    models.append(_normalize_search_item(it))
-                except Exception as e:
-                    logger.warning(f"Skipping invalid search item: {e}")
-
-    # Deduplicate by (shop_id, item_id)
-    models = deduplicate_models(models)
-
-    rows: List[Dict[str, Any]] = [m.model_dump() for m in models]
+            k = row_model.key()
+            if k is not None:
+                if k in seen:
+                    continue
+                seen.add(k)
+            row = row_model.model_dump()
+            if k is None:
+                keyless.append(row)
+            rows.append(row)
 
     data_dir = ensure_data_dir()
     stem = jsonl_path.stem  # e.g., cdp_search_12345
     json_out = data_dir / f"{stem}_export.json"
     csv_out = data_dir / f"{stem}_export.csv"
     write_json(rows, json_out)
-    write_csv(rows, csv_out)
+    write_csv(rows, csv_out, fieldnames=SEARCH_FIELDS)
     return json_out, csv_out, rows
@@ -39,11 +39,23 @@ class Settings(BaseSettings):
         True, alias="USE_PERSISTENT_CONTEXT_FOR_SEARCH"
     )
     disable_3pc_phaseout: bool = Field(True, alias="DISABLE_3PC_PHASEOUT")
+    # Login auto-detection: save the session once this selector/cookie appears (else wait for Enter)
+    login_detect_selector: Optional[str] = Field(None, alias="LOGIN_DETECT_SELECTOR")
+    login_detect_cookie: Optional[str] = Field(None, alias="LOGIN_DETECT_COOKIE")
+    login_timeout_ms: int = Field(300_000, alias="LOGIN_TIMEOUT_MS")
+    # Abort image/font/media and analytics requests in Playwright search contexts
+    block_heavy_resources: bool = Field(True, alias="BLOCK_HEAVY_RESOURCES")
+    # Serve cacheable scripts/stylesheets from an in-memory LRU persisted in data_dir
+    response_cache: bool = Field(True, alias="RESPONSE_CACHE")
+    response_cache_mb: int = Field(64, alias="RESPONSE_CACHE_MB")
+    # Attach Playwright to an already running Chrome (e.g. http://127.0.0.1:9222) instead of launching one
+    cdp_endpoint: Optional[str] = Field(None, alias="SHOPEE_CDP_ENDPOINT")
 
     # CDP tuning
     cdp_inactivity_s: float = Field(8.0, alias="CDP_INACTIVITY_S")
     cdp_circuit_enabled: bool = Field(True, alias="CDP_CIRCUIT_ENABLED")
     cdp_max_concurrency: int = Field(12, alias="CDP_MAX_CONCURRENCY")
+    cdp_reuse_chrome: bool = Field(False, alias="CDP_REUSE_CHROME")
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
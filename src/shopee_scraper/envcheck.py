@@ -1,24 +1,32 @@
 from __future__ import annotations
 
 import re
-from typing import List, Tuple, Optional
+from typing import List, NamedTuple, Tuple, Optional
 
 from .config import settings
 
 
+class Region(NamedTuple):
+    locale: str
+    timezone: str
+
+
 KNOWN_DOMAINS = {
-    "shopee.com.br": {"locale": "pt-BR", "timezone": "America/Sao_Paulo"},
-    "shopee.com.mx": {"locale": "es-MX", "timezone": "America/Mexico_City"},
-    "shopee.com.my": {"locale": "en-MY", "timezone": "Asia/Kuala_Lumpur"},
-    "shopee.sg": {"locale": "en-SG", "timezone": "Asia/Singapore"},
-    "shopee.ph": {"locale": "en-PH", "timezone": "Asia/Manila"},
-    "shopee.co.id": {"locale": "id-ID", "timezone": "Asia/Jakarta"},
-    "shopee.vn": {"locale": "vi-VN", "timezone": "Asia/Ho_Chi_Minh"},
-    "shopee.co.th": {"locale": "th-TH", "timezone": "Asia/Bangkok"},
+    "shopee.com.br": Region("pt-BR", "America/Sao_Paulo"),
+    "shopee.com.mx": Region("es-MX", "America/Mexico_City"),
+    "shopee.com.my": Region("en-MY", "Asia/Kuala_Lumpur"),
+    "shopee.sg": Region("en-SG", "Asia/Singapore"),
+    "shopee.ph": Region("en-PH", "Asia/Manila"),
+    "shopee.co.id": Region("id-ID", "Asia/Jakarta"),
+    "shopee.vn": Region("vi-VN", "Asia/Ho_Chi_Minh"),
+    "shopee.co.th": Region("th-TH", "Asia/Bangkok"),
 }
 
 
-def suggest_region_for_domain(domain: str) -> Optional[dict]:
+_PROXY_SCHEME_RE = re.compile(r"^(?:https?|socks5h?|socks4a?)://")
+
+
+def suggest_region_for_domain(domain: str) -> Optional[Region]:
     return KNOWN_DOMAINS.get(domain)
 
 
@@ -28,22 +36,22 @@ def validate_environment() -> List[Tuple[str, str]]:
 
     # Domain
     domain = settings.shopee_domain
-    if domain not in KNOWN_DOMAINS:
+    rec = KNOWN_DOMAINS.get(domain)
+    if rec is None:
         issues.append(("warn", f"SHOPEE_DOMAIN='{domain}' não reconhecido. Verifique a região correta."))
     else:
-        rec = KNOWN_DOMAINS[domain]
-        if settings.locale != rec["locale"]:
+        if settings.locale != rec.locale:
             issues.append(
                 (
                     "warn",
-                    f"LOCALE='{settings.locale}' diferente do recomendado para {domain} ({rec['locale']}).",
+                    f"LOCALE='{settings.locale}' diferente do recomendado para {domain} ({rec.locale}).",
                 )
             )
-        if settings.timezone_id != rec["timezone"]:
+        if settings.timezone_id != rec.timezone:
             issues.append(
                 (
                     "warn",
-                    f"TIMEZONE='{settings.timezone_id}' diferente do recomendado para {domain} ({rec['timezone']}).",
+                    f"TIMEZONE='{settings.timezone_id}' diferente do recomendado para {domain} ({rec.timezone}).",
                 )
             )
 
@@ -54,7 +62,7 @@ def validate_environment() -> List[Tuple[str, str]]:
     # Proxy
     proxy = settings.proxy_url or ""
     if proxy:
-        if not re.match(r"^(https?|socks5|socks4|socks5h|socks4a)://", proxy):
+        if not _PROXY_SCHEME_RE.match(proxy):
             issues.append(("warn", "PROXY_URL sem esquema reconhecido (http/socks4/socks5)."))
         # Simple format check host:port presence
         if "@" in proxy:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -42,11 +43,12 @@ def log_event(event: str, **fields: Any) -> None:
 
     Fields should be JSON-serializable. Adds common context: profile, proxy.
     """
-    configure_json_logging()  # ensure sink exists
+    if not _JSON_SINK_CONFIGURED:
+        configure_json_logging()  # ensure sink exists
     payload: Dict[str, Any] = {
         "event": event,
         "ts": int(time.time()),
-        "profile": _current_profile(),
+        "profile": _profile_for(settings.user_data_dir),
         "proxy": settings.proxy_url or None,
     }
     payload.update(fields)
@@ -54,7 +56,8 @@ def log_event(event: str, **fields: Any) -> None:
     logger.bind(**payload).info(event)
 
 
-def _current_profile() -> str:
-    p = Path(settings.user_data_dir)
-    return p.name or "default"
+@lru_cache(maxsize=8)
+def _profile_for(user_data_dir: str) -> str:
+    # Keyed on the directory string so a runtime profile switch is still picked up
+    return Path(user_data_dir).name or "default"
 
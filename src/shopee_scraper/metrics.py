@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import csv
 import json
+import os
+import re
 import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # stdlib json fallback
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass
 class Bucket:
@@ -32,16 +45,117 @@ class Bucket:
         return (self.duration_sum / self.duration_count) if self.duration_count else 0.0
 
 
-def _iter_jsonl(path: Path) -> Iterable[dict]:
+_TS_KEY = b'"ts":'
+_TS_VALUE_RE = re.compile(rb'"ts": ?(\d+)[,} ]')
+
+
+def _line_ts(line: bytes) -> Optional[int]:
+    """Integer value of the line's only "ts" key, read without parsing; None if unsure."""
+    if line.count(_TS_KEY) != 1:
+        return None
+    # float, string, null or negative values do not match: the parser decides
+    m = _TS_VALUE_RE.search(line)
+    return int(m.group(1)) if m else None
+
+
+def _needle(value: Optional[str], implicit: str) -> Optional[bytes]:
+    # A filter value can only be matched as raw bytes when JSON writes it verbatim.
+    # `implicit` is what a missing/null field compares as, so it cannot be prefiltered.
+    if not value or value == implicit or not value.isascii() or not value.isprintable():
+        return None
+    if '"' in value or "\\" in value:
+        return None
+    return f'"{value}"'.encode()
+
+
+class _BucketDict(dict):
+    """Creates the (profile, proxy) bucket on first access: one lookup per event."""
+
+    def __missing__(self, key: Tuple[str, Optional[str]]) -> Bucket:
+        b = self[key] = Bucket(profile=key[0], proxy=key[1])
+        return b
+
+
+# Logs smaller than this are aggregated in-process; larger ones are split across worker
+# processes, each taking at least _RANGE_MIN_BYTES
+_PARALLEL_MIN_BYTES = 8 << 20
+_RANGE_MIN_BYTES = 4 << 20
+
+
+def _split_ranges(path: Path, start: int, end: int) -> List[Tuple[int, int]]:
+    """Split [start, end) into per-worker byte ranges that begin on line boundaries."""
+    size = end - start
+    n = min(os.cpu_count() or 1, size // _RANGE_MIN_BYTES)
+    if size < _PARALLEL_MIN_BYTES or n < 2:
+        return [(start, end)]
+    bounds = [start]
+    with path.open("rb") as f:
+        for k in range(1, n):
+            # Resume after the newline at or past the cut, so no line is split between workers
+            f.seek(start + size * k // n - 1)
+            f.readline()
+            pos = min(f.tell(), end)
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    if end > bounds[-1]:
+        bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _map_ranges(fn: Callable[..., Any], path: Path, ranges: List[Tuple[int, int]], *args: Any) -> List[Any]:
+    """Run fn(path, start, end, *args) per range, in worker processes when there are several."""
+    if len(ranges) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+                futures = [ex.submit(fn, path, start, end, *args) for start, end in ranges]
+                return [fut.result() for fut in futures]
+        except (OSError, BrokenProcessPool):
+            pass  # no process support here (sandbox, frozen app): aggregate in-process
+    return [fn(path, start, end, *args) for start, end in ranges]
+
+
+def _bounded_lines(f, nbytes: int) -> Iterator[bytes]:
+    # Lines starting within the next `nbytes`; the last one is read in full
+    for line in f:
+        if nbytes <= 0:
+            return
+        nbytes -= len(line)
+        yield line
+
+
+def _iter_jsonl(
+    path: Path,
+    *,
+    needles: Iterable[bytes] = (),
+    min_ts: int = 0,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterable[dict]:
+    """Parse JSONL records, dropping lines that cannot pass the filters before parsing them.
+
+    `needles` must all occur in a line's raw bytes; lines whose "ts" is below `min_ts` are skipped.
+    `start`/`end` restrict parsing to the lines beginning in that byte range.
+    """
     if not path.exists():
         return []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
+    needles = tuple(needles)
+    # Binary lines with a 1 MiB buffer: both parsers take UTF-8 bytes, so nothing is decoded per line
+    with path.open("rb", buffering=1 << 20) as f:
+        if start:
+            f.seek(start)
+        for line in (f if end is None else _bounded_lines(f, end - start)):
+            if line[-1:] == b"\n":
+                line = line.rstrip(b"\r\n")
             if not line:
                 continue
+            if needles and not all(n in line for n in needles):
+                continue
+            if min_ts:
+                ts = _line_ts(line)
+                if ts is not None and ts < min_ts:
+                    continue
             try:
-                yield json.loads(line)
+                yield _json_loads(line)
             except Exception:
                 continue
 
@@ -62,26 +176,78 @@ def aggregate_metrics(
     since_ts: Optional[int] = None,
     profile_filter: Optional[str] = None,
     proxy_filter: Optional[str] = None,
+    cache: bool = False,
 ) -> Tuple[Dict[Tuple[str, Optional[str]], Bucket], Bucket]:
-    buckets: Dict[Tuple[str, Optional[str]], Bucket] = {}
+    """Aggregate capture summaries and circuit trips per (profile, proxy).
+
+    With `cache=True` the log is folded into a rollup stored next to it (see
+    `_update_rollup`), so repeated reports only parse the bytes appended since. The
+    default full scan rejects filtered-out lines before parsing them instead.
+    """
+    if cache:
+        return _aggregate_rollup(
+            *_update_rollup(path), since_ts=since_ts, profile_filter=profile_filter, proxy_filter=proxy_filter
+        )
+    size = path.stat().st_size if path.exists() else 0
+    parts = _map_ranges(
+        _aggregate_range, path, _split_ranges(path, 0, size), int(time.time()), since_ts or 0, profile_filter, proxy_filter
+    )
+    if len(parts) == 1:
+        buckets = parts[0]
+    else:
+        # Counters are sums: merging the ranges in file order also keeps first-seen bucket order
+        buckets = _BucketDict()
+        for part in parts:
+            for key, pb in part.items():
+                _merge_bucket(buckets[key], pb)
+    return buckets, _overall_of(buckets)
+
+
+def _overall_of(buckets: Dict[Tuple[str, Optional[str]], Bucket]) -> Bucket:
+    # The overall row is the sum of the buckets: derived once instead of updated per event
     overall = Bucket(profile="(all)", proxy=None)
-    now = int(time.time())
-    min_ts = since_ts or 0
-    for rec in _iter_jsonl(path):
-        ts = int(rec.get("ts") or now)
-        if ts < min_ts:
-            continue
-        profile = rec.get("profile") or "default"
-        proxy = rec.get("proxy")
-        if profile_filter and str(profile) != profile_filter:
+    for b in buckets.values():
+        _merge_bucket(overall, b)
+    return overall
+
+
+def _aggregate_range(
+    path: Path,
+    start: int,
+    end: int,
+    now: int,
+    min_ts: int,
+    profile_filter: Optional[str],
+    proxy_filter: Optional[str],
+) -> Dict[Tuple[str, Optional[str]], Bucket]:
+    buckets: Dict[Tuple[str, Optional[str]], Bucket] = _BucketDict()
+    # Cheap byte-level gates; the exact checks below still run on every parsed record
+    needles = [n for n in (_needle(profile_filter, "default"), _needle(proxy_filter, "None")) if n]
+    for rec in _iter_jsonl(path, needles=needles, min_ts=min_ts, start=start, end=end):
+        get = rec.get
+        if min_ts:
+            # orjson already yields ints: only coerce other types
+            ts = get("ts")
+            if not ts:
+                ts = now
+            elif type(ts) is not int:
+                ts = int(ts)
+            if ts < min_ts:
+                continue
+        profile = get("profile") or "default"
+        if type(profile) is not str:
+            profile = str(profile)
+        proxy = get("proxy")
+        if proxy is not None and type(proxy) is not str:
+            proxy = str(proxy)
+        if profile_filter and profile != profile_filter:
             continue
-        if proxy_filter and str(proxy) != proxy_filter:
+        if proxy_filter and (proxy if proxy is not None else "None") != proxy_filter:
             continue
-        etype = _event_type(rec)
-        key = (str(profile), str(proxy) if proxy is not None else None)
-        if key not in buckets:
-            buckets[key] = Bucket(profile=key[0], proxy=key[1])
-        b = buckets[key]
+        etype = get("event")
+        if type(etype) is not str:
+            etype = _event_type(rec)
+        b = buckets[(profile, proxy)]
         # Summaries
         if etype == "cdp_capture_summary":
             captured = int(rec.get("captured") or 0)
@@ -91,32 +257,279 @@ def aggregate_metrics(
             pages = int(rec.get("pages") or 0)
 
             b.captures_total += 1
-            overall.captures_total += 1
             if captured > 0:
                 b.captures_ok += 1
-                overall.captures_ok += 1
             b.captured_items_sum += captured
-            overall.captured_items_sum += captured
-
             b.duration_sum += duration
             b.duration_count += 1
-            overall.duration_sum += duration
-            overall.duration_count += 1
-
             b.navigate_attempts_sum += navigate_attempts
-            overall.navigate_attempts_sum += navigate_attempts
-
             b.pages_sum += pages
-            overall.pages_sum += pages
 
         elif etype == "circuit_trip":
             reason = rec.get("reason") or "unknown"
             b.blocks += 1
             b.block_reasons[str(reason)] += 1
-            overall.blocks += 1
-            overall.block_reasons[str(reason)] += 1
 
-    return buckets, overall
+    return buckets
+
+
+# ----------------------- ROLLUP CACHE -----------------------
+
+_ROLLUP_VERSION = 2
+_ROLLUP_HEAD = 256  # bytes fingerprinted to detect a rotated/rewritten log
+_ROLLUP_EVENTS = ("cdp_capture_summary", "circuit_trip")
+
+# (ts or None when the event has none, profile, proxy)
+RollupKey = Tuple[Optional[int], str, Optional[str]]
+# (profile, proxy) -> latest ts seen for it, None when one of its events had no ts
+Seen = Dict[Tuple[str, Optional[str]], Optional[int]]
+
+
+def _rollup_path(path: Path) -> Path:
+    # Hidden sibling file: does not match loguru's rotation/retention glob for the log
+    return path.with_name(f".{path.name}.rollup.json")
+
+
+def _apply_event(b: Bucket, etype: Optional[str], rec: dict) -> None:
+    if etype == "cdp_capture_summary":
+        captured = int(rec.get("captured") or 0)
+        counters = rec.get("counters") or {}
+        b.captures_total += 1
+        if captured > 0:
+            b.captures_ok += 1
+        b.captured_items_sum += captured
+        b.duration_sum += float(rec.get("duration_s") or 0.0)
+        b.duration_count += 1
+        b.navigate_attempts_sum += int(counters.get("navigate_attempts", 0)) if isinstance(counters, dict) else 0
+        b.pages_sum += int(rec.get("pages") or 0)
+    elif etype == "circuit_trip":
+        b.blocks += 1
+        b.block_reasons[str(rec.get("reason") or "unknown")] += 1
+
+
+def _merge_bucket(dst: Bucket, src: Bucket) -> None:
+    dst.captures_total += src.captures_total
+    dst.captures_ok += src.captures_ok
+    dst.captured_items_sum += src.captured_items_sum
+    dst.duration_sum += src.duration_sum
+    dst.duration_count += src.duration_count
+    dst.navigate_attempts_sum += src.navigate_attempts_sum
+    dst.pages_sum += src.pages_sum
+    dst.blocks += src.blocks
+    dst.block_reasons.update(src.block_reasons)
+
+
+def _merge_seen(dst: Seen, src: Seen) -> None:
+    for pair, ts in src.items():
+        if pair not in dst:
+            dst[pair] = ts
+        elif ts is None or (dst[pair] is not None and ts > dst[pair]):
+            dst[pair] = ts
+
+
+def _load_rollup(cache_path: Path) -> Optional[dict]:
+    try:
+        state = _json_loads(cache_path.read_bytes())
+    except Exception:
+        return None
+    if not isinstance(state, dict) or state.get("version") != _ROLLUP_VERSION:
+        return None
+    return state
+
+
+def _save_rollup(cache_path: Path, state: dict) -> None:
+    tmp = cache_path.with_suffix(".tmp")
+    try:
+        if orjson is not None:
+            tmp.write_bytes(orjson.dumps(state))
+        else:
+            tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(cache_path)
+    except OSError:
+        pass  # read-only log dir: the report still works, just without the cache
+
+
+def _complete_end(path: Path, start: int, end: int) -> int:
+    """Offset just past the last newline in [start, end): where the complete lines stop."""
+    with path.open("rb") as f:
+        pos = end
+        while pos > start:
+            n = min(1 << 16, pos - start)
+            f.seek(pos - n)
+            i = f.read(n).rfind(b"\n")
+            if i >= 0:
+                return pos - n + i + 1
+            pos -= n
+    return start
+
+
+def _update_rollup(path: Path) -> Tuple[Seen, Dict[RollupKey, Bucket]]:
+    """Fold the log into the rollup stored next to it, parsing only new bytes.
+
+    Only capture summaries and circuit trips are kept per (second, profile, proxy),
+    so any `since_ts` window is answered exactly; every other event just records
+    the latest ts of its (profile, proxy). A log that shrank, was replaced, or
+    changed its first bytes is re-read from the start; a trailing line without its
+    newline is left for the next run. The file is only rewritten when lines were added.
+    """
+    seen: Seen = {}
+    rows: Dict[RollupKey, Bucket] = {}
+    if not path.exists():
+        return seen, rows
+    cache_path = _rollup_path(path)
+    st = path.stat()
+    with path.open("rb") as f:
+        head = f.read(_ROLLUP_HEAD).hex()
+    offset = 0
+    state = _load_rollup(cache_path)
+    if (
+        state
+        and state.get("ino") == st.st_ino
+        and state.get("head", "")[: len(head)] == head[: len(state.get("head", ""))]
+        and 0 <= int(state.get("offset", -1)) <= st.st_size
+    ):
+        try:
+            for profile, proxy, ts in state.get("seen", []):
+                seen[(profile, proxy)] = ts
+            for row in state.get("rows", []):
+                ts, profile, proxy, *sums, reasons = row
+                b = Bucket(profile, proxy, *sums)
+                b.block_reasons.update(reasons)
+                rows[(ts, profile, proxy)] = b
+            offset = int(state["offset"])
+        except (TypeError, ValueError):
+            seen, rows = {}, {}  # damaged cache: fold the whole log again
+
+    end = _complete_end(path, offset, st.st_size)
+    if end == offset:
+        return seen, rows
+
+    # New complete lines only; large tails are folded by several worker processes
+    for part_seen, part_rows in _map_ranges(_rollup_range, path, _split_ranges(path, offset, end)):
+        _merge_seen(seen, part_seen)
+        for key, pb in part_rows.items():
+            b = rows.get(key)
+            if b is None:
+                rows[key] = pb
+            else:
+                _merge_bucket(b, pb)
+
+    _save_rollup(
+        cache_path,
+        {
+            "version": _ROLLUP_VERSION,
+            "ino": st.st_ino,
+            "head": head,
+            "offset": end,
+            "seen": [[profile, proxy, ts] for (profile, proxy), ts in seen.items()],
+            "rows": [
+                [
+                    ts, profile, proxy,
+                    b.captures_total, b.captures_ok, b.captured_items_sum, b.duration_sum, b.duration_count,
+                    b.navigate_attempts_sum, b.pages_sum, b.blocks, dict(b.block_reasons),
+                ]
+                for (ts, profile, proxy), b in rows.items()
+            ],
+        },
+    )
+    return seen, rows
+
+
+def _rollup_range(path: Path, start: int, end: int) -> Tuple[Seen, Dict[RollupKey, Bucket]]:
+    """Rollup of the lines beginning in [start, end), read like `_aggregate_range` reads them."""
+    seen: Seen = {}
+    rows: Dict[RollupKey, Bucket] = {}
+    for rec in _iter_jsonl(path, start=start, end=end):
+        get = rec.get
+        ts = get("ts")
+        if not ts:
+            ts = None
+        elif type(ts) is not int:
+            ts = int(ts)
+        profile = get("profile") or "default"
+        if type(profile) is not str:
+            profile = str(profile)
+        proxy = get("proxy")
+        if proxy is not None and type(proxy) is not str:
+            proxy = str(proxy)
+        pair = (profile, proxy)
+        if pair not in seen:
+            seen[pair] = ts
+        else:
+            last = seen[pair]
+            if last is not None and (ts is None or ts > last):
+                seen[pair] = ts
+        etype = get("event")
+        if type(etype) is not str:
+            etype = _event_type(rec)
+        if etype in _ROLLUP_EVENTS:
+            key = (ts, profile, proxy)
+            b = rows.get(key)
+            if b is None:
+                b = rows[key] = Bucket(profile=profile, proxy=proxy)
+            _apply_event(b, etype, rec)
+    return seen, rows
+
+
+def _aggregate_rollup(
+    seen: Seen,
+    rows: Dict[RollupKey, Bucket],
+    *,
+    since_ts: Optional[int] = None,
+    profile_filter: Optional[str] = None,
+    proxy_filter: Optional[str] = None,
+) -> Tuple[Dict[Tuple[str, Optional[str]], Bucket], Bucket]:
+    buckets: Dict[Tuple[str, Optional[str]], Bucket] = _BucketDict()
+    now = int(time.time())
+    min_ts = since_ts or 0
+    # Events without a timestamp count as "now", as in the uncached path. A (profile, proxy)
+    # with any event in the window gets a row, in the order it first appeared in the log
+    for (profile, proxy), last in seen.items():
+        if (last or now) < min_ts:
+            continue
+        if profile_filter and profile != profile_filter:
+            continue
+        if proxy_filter and (proxy if proxy is not None else "None") != proxy_filter:
+            continue
+        buckets[(profile, proxy)]
+    for (ts, profile, proxy), rb in rows.items():
+        if (ts or now) < min_ts or (profile, proxy) not in buckets:
+            continue
+        _merge_bucket(buckets[(profile, proxy)], rb)
+    return buckets, _overall_of(buckets)
+
+
+_RIGHT = {"justify": "right"}
+_SUMMARY_COLUMNS: Tuple[Tuple[str, Dict[str, str]], ...] = (
+    ("Profile", {}),
+    ("Proxy", {"overflow": "fold"}),
+    ("Captures", _RIGHT),
+    ("OK", _RIGHT),
+    ("Success %", _RIGHT),
+    ("Items", _RIGHT),
+    ("Avg dur (s)", _RIGHT),
+    ("Blocks", _RIGHT),
+    ("NavAtt", _RIGHT),
+    ("Pages", _RIGHT),
+)
+_REASON_COLUMNS: Tuple[Tuple[str, Dict[str, str]], ...] = (("Reason", {}), ("Count", _RIGHT))
+
+_CONSOLE: Optional[Console] = None
+
+
+def _get_console() -> Console:
+    # Terminal detection runs once per process, not once per report
+    global _CONSOLE
+    if _CONSOLE is None:
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
+def _make_table(title: str, columns: Iterable[Tuple[str, Dict[str, str]]], **table_kwargs: Any) -> Table:
+    table = Table(title=title, **table_kwargs)
+    for name, column_kwargs in columns:
+        table.add_column(name, **column_kwargs)
+    return table
 
 
 def render_report(
@@ -125,28 +538,20 @@ def render_report(
     *,
     console: Optional[Console] = None,
 ) -> None:
-    console = console or Console()
+    console = console or _get_console()
     # Summary table
-    table = Table(title="CDP Metrics Summary")
-    table.add_column("Profile")
-    table.add_column("Proxy", overflow="fold")
-    table.add_column("Captures", justify="right")
-    table.add_column("OK", justify="right")
-    table.add_column("Success %", justify="right")
-    table.add_column("Items", justify="right")
-    table.add_column("Avg dur (s)", justify="right")
-    table.add_column("Blocks", justify="right")
-    table.add_column("NavAtt", justify="right")
-    table.add_column("Pages", justify="right")
-
-    # Sort by blocks desc then success asc
-    for (_, b) in sorted(buckets.items(), key=lambda kv: (-kv[1].blocks, kv[1].success_rate())):
+    table = _make_table("CDP Metrics Summary", _SUMMARY_COLUMNS)
+
+    # Sort by blocks desc then success asc; the rate is computed once per bucket and reused
+    # for the row (the index keeps ties in insertion order without comparing buckets)
+    ranked = sorted((-b.blocks, b.success_rate(), i, b) for i, b in enumerate(buckets.values()))
+    for _, rate, _, b in ranked:
         table.add_row(
             b.profile,
             str(b.proxy or "-")[:60],
             str(b.captures_total),
             str(b.captures_ok),
-            f"{b.success_rate()*100:.1f}",
+            f"{rate*100:.1f}",
             str(b.captured_items_sum),
             f"{b.avg_duration():.2f}",
             str(b.blocks),
@@ -165,9 +570,7 @@ def render_report(
 
     # Top block reasons
     if overall.blocks:
-        t2 = Table(title="Top block reasons", show_edge=False)
-        t2.add_column("Reason")
-        t2.add_column("Count", justify="right")
+        t2 = _make_table("Top block reasons", _REASON_COLUMNS, show_edge=False)
         for reason, cnt in overall.block_reasons.most_common(10):
             t2.add_row(reason, str(cnt))
         console.print(t2)
@@ -179,11 +582,14 @@ def run_report(
     hours: int = 0,
     profile: Optional[str] = None,
     proxy: Optional[str] = None,
+    cache: bool = False,
 ) -> None:
     since_ts = None
     if hours and hours > 0:
         since_ts = int(time.time()) - hours * 3600
-    buckets, overall = aggregate_metrics(path, since_ts=since_ts, profile_filter=profile, proxy_filter=proxy)
+    buckets, overall = aggregate_metrics(
+        path, since_ts=since_ts, profile_filter=profile, proxy_filter=proxy, cache=cache
+    )
     render_report(buckets, overall)
 
 
@@ -195,11 +601,14 @@ def export_metrics(
     proxy: Optional[str] = None,
     out_csv: Optional[Path] = None,
     out_json: Optional[Path] = None,
+    cache: bool = False,
 ) -> Tuple[Path, Path]:
     since_ts = None
     if hours and hours > 0:
         since_ts = int(time.time()) - hours * 3600
-    buckets, overall = aggregate_metrics(path, since_ts=since_ts, profile_filter=profile, proxy_filter=proxy)
+    buckets, overall = aggregate_metrics(
+        path, since_ts=since_ts, profile_filter=profile, proxy_filter=proxy, cache=cache
+    )
 
     # Prepare rows
     rows = []
@@ -236,29 +645,33 @@ def export_metrics(
     json_path = out_json or (out_dir / "metrics_summary.json")
 
     # CSV: flatten block_reasons to JSON string
-    import csv as _csv
-    with csv_path.open("w", encoding="utf-8", newline="") as f:
-        fieldnames = [
-            "profile",
-            "proxy",
-            "captures_total",
-            "captures_ok",
-            "success_rate",
-            "captured_items_sum",
-            "avg_duration_s",
-            "blocks",
-            "navigate_attempts_sum",
-            "pages_sum",
-            "block_reasons",
-        ]
-        w = _csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            r2 = dict(r)
-            r2["block_reasons"] = json.dumps(r2.get("block_reasons", {}), ensure_ascii=False)
-            w.writerow(r2)
-
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump({"rows": rows, "overall": overall_row}, f, ensure_ascii=False, indent=2)
+    fieldnames = (
+        "profile",
+        "proxy",
+        "captures_total",
+        "captures_ok",
+        "success_rate",
+        "captured_items_sum",
+        "avg_duration_s",
+        "blocks",
+        "navigate_attempts_sum",
+        "pages_sum",
+        "block_reasons",
+    )
+    csv_rows = [
+        tuple(r[k] for k in fieldnames[:-1]) + (json.dumps(r["block_reasons"], ensure_ascii=False),)
+        for r in rows
+    ]
+    with csv_path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(csv_rows)
+
+    summary = {"rows": rows, "overall": overall_row}
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with json_path.open("w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
 
     return csv_path, json_path
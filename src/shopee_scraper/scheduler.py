@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import csv
 import json
+import sqlite3
+import threading
 import time
 import uuid
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # stdlib json fallback
+
 from .utils import ensure_data_dir
 from .logs import log_event
 from .cdp.collector import (
@@ -21,6 +29,73 @@ from .cdp.collector import (
 from .cdp.exporter import export_search_from_jsonl, export_pdp_from_jsonl
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks(
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    max_attempts INTEGER NOT NULL,
+    created_ts INTEGER NOT NULL,
+    updated_ts INTEGER NOT NULL,
+    params BLOB,
+    result BLOB,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, created_ts);
+"""
+_COLUMNS = "id, kind, status, attempts, max_attempts, created_ts, updated_ts, params, result, error"
+
+_db_lock = threading.Lock()
+_db_conns: Dict[str, sqlite3.Connection] = {}
+
+
+def _dumps(obj: Any) -> Any:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj, ensure_ascii=False)
+
+
+def _loads(raw: Any) -> Any:
+    if raw is None:
+        return {}
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _db() -> sqlite3.Connection:
+    """Connection to data/queue/tasks.sqlite (WAL), one per database path per process."""
+    qdir = ensure_data_dir() / "queue"
+    db_path = qdir / "tasks.sqlite"
+    key = str(db_path)
+    with _db_lock:
+        conn = _db_conns.get(key)
+        if conn is None:
+            qdir.mkdir(parents=True, exist_ok=True)
+            fresh = not db_path.exists()
+            conn = sqlite3.connect(key, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            if fresh:
+                _import_legacy_tasks(conn, qdir / "tasks")
+            _db_conns[key] = conn
+        return conn
+
+
+def _import_legacy_tasks(conn: sqlite3.Connection, legacy_dir: Path) -> None:
+    # Queues created before the SQLite store kept one JSON file per task
+    if not legacy_dir.exists():
+        return
+    count = 0
+    for p in sorted(legacy_dir.glob("*.json")):
+        try:
+            t = Task(**json.loads(p.read_text(encoding="utf-8")))
+        except Exception:
+            continue
+        conn.execute(f"INSERT OR IGNORE INTO tasks({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)", t._row())
+        count += 1
+    if count:
+        logger.info(f"Queue: imported {count} task(s) from {legacy_dir}")
+
+
 @dataclass
 class Task:
     id: str
@@ -33,19 +108,43 @@ class Task:
     updated_ts: int
     result: Dict[str, Any]
     error: Optional[str]
+    # Column values as last written, so save() only sends what changed
+    _saved: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _row(self) -> tuple:
+        return (
+            self.id, self.kind, self.status, self.attempts, self.max_attempts,
+            self.created_ts, self.updated_ts, _dumps(self.params), _dumps(self.result), self.error,
+        )
 
-    def path(self) -> Path:
-        qdir = ensure_data_dir() / "queue" / "tasks"
-        qdir.mkdir(parents=True, exist_ok=True)
-        return qdir / f"{self.id}.json"
+    def _mark_saved(self) -> None:
+        self._saved = {
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "error": self.error,
+            "result": dict(self.result),
+        }
 
     def save(self) -> None:
         self.updated_ts = int(time.time())
-        p = self.path()
-        tmp = p.with_suffix(".tmp.json")
-        with tmp.open("w", encoding="utf-8") as f:
-            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
-        tmp.replace(p)
+        saved = self._saved
+        sets = ["updated_ts=?"]
+        args: List[Any] = [self.updated_ts]
+        for col in ("status", "attempts", "max_attempts", "error"):
+            value = getattr(self, col)
+            if col not in saved or saved[col] != value:
+                sets.append(f"{col}=?")
+                args.append(value)
+        # result is the only sizeable column: re-serialize it only when it changed
+        if "result" not in saved or saved["result"] != self.result:
+            sets.append("result=?")
+            args.append(_dumps(self.result))
+        conn = _db()
+        cur = conn.execute(f"UPDATE tasks SET {', '.join(sets)} WHERE id=?", (*args, self.id))
+        if cur.rowcount == 0:
+            conn.execute(f"INSERT INTO tasks({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)", self._row())
+        self._mark_saved()
 
 
 def _new_task(kind: str, params: Dict[str, Any], *, max_attempts: int = 2) -> Task:
@@ -66,28 +165,42 @@ def _new_task(kind: str, params: Dict[str, Any], *, max_attempts: int = 2) -> Ta
 
 def add_task(kind: str, params: Dict[str, Any], *, max_attempts: int = 2) -> Task:
     t = _new_task(kind, params, max_attempts=max_attempts)
-    t.save()
+    _db().execute(f"INSERT INTO tasks({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)", t._row())
+    t._mark_saved()
     logger.info(f"Queue: added task {t.kind} id={t.id}")
     return t
 
 
 def load_tasks(status_filter: Optional[str] = None) -> List[Task]:
-    qdir = ensure_data_dir() / "queue" / "tasks"
-    if not qdir.exists():
-        return []
+    sql = f"SELECT {_COLUMNS} FROM tasks"
+    args: tuple = ()
+    if status_filter:
+        sql += " WHERE status=?"  # served by idx_tasks_status
+        args = (status_filter,)
     out: List[Task] = []
-    for p in sorted(qdir.glob("*.json")):
-        try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-            t = Task(**data)
-            if status_filter and t.status != status_filter:
-                continue
-            out.append(t)
-        except Exception:
-            continue
+    for (tid, kind, status, attempts, max_attempts, created_ts, updated_ts, params, result, error) in _db().execute(
+        sql + " ORDER BY created_ts, id", args
+    ):
+        t = Task(tid, kind, _loads(params), status, attempts, max_attempts, created_ts, updated_ts, _loads(result), error)
+        t._mark_saved()
+        out.append(t)
     return out
 
 
+def _load_export_urls(p: Path) -> List[str]:
+    """Product URLs from a search export (.json or .csv), reading only the `url` column."""
+    if p.suffix.lower() == ".json":
+        data = _loads(p.read_bytes())
+        return [r["url"] for r in data if isinstance(r, dict) and r.get("url")]
+    with p.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "url" not in header:
+            return []
+        url_idx = header.index("url")
+        return [row[url_idx] for row in reader if url_idx < len(row) and row[url_idx]]
+
+
 def _run_task(t: Task) -> Task:
     t.status = "running"
     t.attempts += 1
@@ -134,10 +247,6 @@ def _run_task(t: Task) -> Task:
             stagger_s = float(t.params.get("stagger_s", 1.0))
 
             # Carregar URLs do export
-            import csv
-            import json as _json
-            from pathlib import Path as _Path
-
             if input_path is None:
                 # encontrar último export de busca
                 import glob, os
@@ -149,22 +258,11 @@ def _run_task(t: Task) -> Task:
                 if not candidates:
                     raise FileNotFoundError("Nenhum export de busca encontrado (data/cdp_search_*_export.*)")
                 input_path = candidates[0]
-            in_path = _Path(input_path)
+            in_path = Path(input_path)
             if not in_path.exists():
                 raise FileNotFoundError(str(in_path))
 
-            def _load_rows(p: _Path):
-                if p.suffix.lower() == ".json":
-                    return _json.loads(p.read_text(encoding="utf-8"))
-                rows = []
-                with p.open("r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for r in reader:
-                        rows.append(r)
-                return rows
-
-            rows = _load_rows(in_path)
-            urls = [r.get("url") for r in rows if r.get("url")]
+            urls = _load_export_urls(in_path)
             if not urls:
                 raise ValueError("Nenhuma URL de produto encontrada no export de busca.")
 
@@ -1,21 +1,24 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Iterable, Iterator, Optional, Set, Tuple, TypeVar, Union
 
 from pydantic import BaseModel, Field, field_validator
 
 
 def _to_int(v) -> Optional[int]:
+    # Most common inputs first; exact type checks skip the isinstance MRO walk
+    if type(v) is int:
+        return v
     if v is None:
         return None
     try:
-        if isinstance(v, bool):
+        if type(v) is float:
+            return int(v)
+        if isinstance(v, int):  # bool and other int subclasses
             return int(v)
-        if isinstance(v, (int,)):
-            return v
         if isinstance(v, float):
             return int(v)
-        s = str(v).strip()
+        s = (v if type(v) is str else str(v)).strip()
         if s.isdigit():
             return int(s)
     except Exception:
@@ -24,12 +27,16 @@ def _to_int(v) -> Optional[int]:
 
 
 def _to_float(v) -> Optional[float]:
+    if type(v) is float:
+        return v
     if v is None:
         return None
     try:
         if isinstance(v, (int, float)):
             return float(v)
-        s = str(v).strip().replace(",", ".")
+        s = (v if type(v) is str else str(v)).strip()
+        if "," in s:
+            s = s.replace(",", ".")
         return float(s)
     except Exception:
         return None
@@ -87,17 +94,22 @@ class PdpItem(BaseModel):
         return (self.shop_id, self.item_id)
 
 
-def deduplicate_models(models):
-    seen = set()
-    out = []
+M = TypeVar("M", bound=Union[SearchItem, PdpItem])
+
+
+def deduplicate_models(models: Iterable[M]) -> Iterator[M]:
+    """Lazily yield models with a new (shop_id, item_id) key; keyless models always pass.
+
+    Wrap in list() when a list is needed.
+    """
+    seen: Set[Tuple[int, int]] = set()
+    seen_add = seen.add
     for m in models:
         k = m.key()
         if k is None:
-            out.append(m)
+            yield m
             continue
         if k in seen:
             continue
-        seen.add(k)
-        out.append(m)
-    return out
-
+        seen_add(k)
+        yield m
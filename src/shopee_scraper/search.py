@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
 from urllib.parse import quote_plus
 
 from playwright.sync_api import TimeoutError as PWTimeoutError
@@ -102,41 +102,67 @@ def search_products(keyword: str, limit: int = 50) -> List[Dict[str, Any]]:
             raise RuntimeError("Não foi possível carregar resultados de busca (login wall/CAPTCHA?).")
 
         def extract() -> List[Dict[str, Any]]:
-            return page.eval_on_selector_all(
-                ".shopee-search-item-result__item, [data-sqe='item']",
+            # One round-trip per scroll that returns only cards not yet extracted. Cards are
+            # remembered in a WeakSet once they have a link and a title (lazy-rendered cards
+            # are re-read until then), and each card is walked once instead of five queries.
+            return page.evaluate(
                 """
-                (nodes) => nodes.map(n => {
-                  const a = n.querySelector('a');
-                  const titleEl = n.querySelector('[data-sqe="name"], [data-sqe="title"], a[title]');
-                  const priceEl = n.querySelector('[data-sqe="price"]');
-                  const soldEl = n.querySelector('[data-sqe="sold"]');
-                  const shopEl = n.querySelector('[data-sqe="shopname"], [data-sqe="shop"]');
-                  return {
-                    title: titleEl ? titleEl.textContent.trim() : null,
-                    price: priceEl ? priceEl.textContent.trim() : null,
-                    sold: soldEl ? soldEl.textContent.trim() : null,
-                    shop: shopEl ? shopEl.textContent.trim() : null,
-                    url: a && a.href ? a.href : null,
-                  };
-                })
+                (selector) => {
+                  const done = window.__scrapedCards || (window.__scrapedCards = new WeakSet());
+                  const out = [];
+                  for (const n of document.querySelectorAll(selector)) {
+                    if (done.has(n)) continue;
+                    let a = null, titleEl = null, priceEl = null, soldEl = null, shopEl = null;
+                    for (const el of n.querySelectorAll('a, [data-sqe]')) {
+                      const sqe = el.getAttribute('data-sqe');
+                      const isA = el.tagName === 'A';
+                      if (isA && !a) a = el;
+                      if (!titleEl && (sqe === 'name' || sqe === 'title' || (isA && el.hasAttribute('title')))) titleEl = el;
+                      else if (!priceEl && sqe === 'price') priceEl = el;
+                      else if (!soldEl && sqe === 'sold') soldEl = el;
+                      else if (!shopEl && (sqe === 'shopname' || sqe === 'shop')) shopEl = el;
+                    }
+                    const rec = {
+                      title: titleEl ? titleEl.textContent.trim() : null,
+                      price: priceEl ? priceEl.textContent.trim() : null,
+                      sold: soldEl ? soldEl.textContent.trim() : null,
+                      shop: shopEl ? shopEl.textContent.trim() : null,
+                      url: a && a.href ? a.href : null,
+                    };
+                    if (rec.url && rec.title) done.add(n);
+                    out.push(rec);
+                  }
+                  return out;
+                }
                 """,
+                ".shopee-search-item-result__item, [data-sqe='item']",
             )
 
         # Scroll/load loop
         max_scrolls = 12
+        # dedup by url/title combo, kept across scrolls
+        seen: Set[Tuple[Any, Any]] = set()
+        seen_add = seen.add
+        results_append = results.append
+        # Stop once scrolling stops surfacing cards; one extra scroll covers a slow lazy load
+        max_stalled_scrolls = 2
+        stalled = 0
         for i in range(max_scrolls):
             current = extract()
-            # dedup by url/title combo
-            seen = {(r.get("url"), r.get("title")) for r in results}
+            before = len(results)
             for r in current:
-                key = (r.get("url"), r.get("title"))
-                if key not in seen and r.get("url"):
-                    results.append(r)
-                    seen.add(key)
+                url = r.get("url")
+                key = (url, r.get("title"))
+                if url and key not in seen:
+                    seen_add(key)
+                    results_append(r)
                 if len(results) >= limit:
                     break
             if len(results) >= limit:
                 break
+            stalled = stalled + 1 if len(results) == before else 0
+            if stalled >= max_stalled_scrolls:
+                break
             # try to scroll to load more
             page.evaluate("window.scrollBy(0, document.body.scrollHeight);")
             jitter_sleep()
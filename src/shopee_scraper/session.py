@@ -7,13 +7,20 @@ Implements:
 
 from __future__ import annotations
 
+import atexit
 import os
+import re
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from playwright.sync_api import sync_playwright, Browser, BrowserContext
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Playwright
+from playwright.sync_api import TimeoutError as PWTimeoutError
 
 from .config import settings
+from .utils import ResponseCache, cache_max_age
 
 
 def storage_state_path() -> Path:
@@ -38,11 +45,166 @@ def _ensure_playwright_browsers_path() -> None:
         os.environ["PLAYWRIGHT_BROWSERS_PATH"] = str(local)
 
 
+def _launch_kwargs() -> Dict[str, Any]:
+    """Chromium launch options shared by login and search (one profile, one configuration)."""
+    launch_kwargs: Dict[str, Any] = {
+        "headless": settings.headless,
+        "args": list(_build_chromium_args(settings.disable_3pc_phaseout)),
+    }
+    if settings.proxy_url:
+        launch_kwargs["proxy"] = {"server": settings.proxy_url}
+    return launch_kwargs
+
+
+def _binary_kwargs(tag: str, mode: str = "") -> Dict[str, Any]:
+    """executable_path/channel launch option from settings, logging which binary is used."""
+    if settings.browser_executable_path:
+        print(f"[{tag}] Using executable{mode}: {settings.browser_executable_path}")
+        return {"executable_path": settings.browser_executable_path}
+    if settings.browser_channel:
+        print(f"[{tag}] Using channel{mode}: {settings.browser_channel}")
+        return {"channel": settings.browser_channel}
+    print(f"[{tag}] Using bundled Chromium{mode}")
+    return {}
+
+
+class BrowserManager:
+    """Process-wide Playwright driver, shared browser and persistent profile contexts.
+
+    Login and search both take their contexts from here, so a run that does
+    ``login`` then searches pays the Chromium cold start once. Get it with
+    ``BrowserManager.instance()``; everything is torn down at interpreter exit.
+    """
+
+    _instance: Optional["BrowserManager"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._pw: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._persistent: Dict[str, BrowserContext] = {}
+
+    @classmethod
+    def instance(cls) -> "BrowserManager":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.shutdown)
+            return cls._instance
+
+    def playwright(self) -> Playwright:
+        with self._lock:
+            if self._pw is None:
+                self._pw = sync_playwright().start()
+            return self._pw
+
+    def browser(self, launch_kwargs: Dict[str, Any], tag: str = "Search") -> Browser:
+        """The shared browser, launched (or attached over CDP) on first use."""
+        with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                p = self.playwright()
+                if settings.cdp_endpoint:
+                    # Shared long-lived Chrome: contexts are multiplexed over its DevTools endpoint
+                    print(f"[{tag}] Connecting over CDP: {settings.cdp_endpoint}")
+                    self._browser = p.chromium.connect_over_cdp(settings.cdp_endpoint)
+                else:
+                    self._browser = p.chromium.launch(**_binary_kwargs(tag), **launch_kwargs)
+            return self._browser
+
+    def get_context(self, launch_kwargs: Dict[str, Any], **context_kwargs: Any) -> BrowserContext:
+        """A fresh context (e.g. from storage_state) in the shared browser."""
+        return self.browser(launch_kwargs).new_context(**context_kwargs)
+
+    def get_persistent_context(
+        self, user_data_dir: str, launch_kwargs: Dict[str, Any], tag: str = "Search"
+    ) -> BrowserContext:
+        """The profile's persistent context, launched once and kept warm until exit."""
+        with self._lock:
+            context = self._persistent.get(user_data_dir)
+            if context is None:
+                context = self.playwright().chromium.launch_persistent_context(
+                    user_data_dir=user_data_dir,
+                    locale=settings.locale,
+                    timezone_id=settings.timezone_id,
+                    **_binary_kwargs(tag, " (persistent)"),
+                    **launch_kwargs,
+                )
+                self._persistent[user_data_dir] = context
+                context.on("close", lambda _: self._persistent.pop(user_data_dir, None))
+            return context
+
+    def release(self, context: BrowserContext, routes: Iterable[Tuple[Any, Callable[[Any], None]]] = ()) -> None:
+        """End a session on ``context``.
+
+        Persistent contexts stay open for the next session: their pages are closed and
+        the session's own ``routes`` ((pattern, handler) pairs it passed to ``route``)
+        removed, leaving other holders' handlers in place. Other contexts are closed.
+        The browser is left running.
+        """
+        with self._lock:
+            persistent = any(c is context for c in self._persistent.values())
+        if not persistent:
+            context.close()
+            return
+        for pattern, handler in routes:
+            context.unroute(pattern, handler)
+        for page in list(context.pages):
+            page.close()
+
+    def shutdown(self) -> None:
+        """Close every context and browser and stop the driver (registered with atexit).
+
+        For a CDP-attached browser ``close()`` only disconnects; the Chrome keeps running.
+        """
+        with self._lock:
+            contexts = list(self._persistent.values())
+            browser, pw = self._browser, self._pw
+            self._persistent.clear()
+            self._browser = self._pw = None
+        for closable in (*contexts, browser):
+            if closable is None:
+                continue
+            try:
+                closable.close()
+            except Exception:
+                pass
+        if pw is not None:
+            pw.stop()
+
+
+def _wait_for_login(page: Page, context: BrowserContext) -> bool:
+    """Poll for the configured login signal (selector and/or cookie) until login_timeout_ms.
+
+    Waits grow 0.5s -> 2s between checks. Returns False on timeout.
+    """
+    selector = settings.login_detect_selector
+    cookie = settings.login_detect_cookie
+    deadline = time.monotonic() + settings.login_timeout_ms / 1000.0
+    delay_ms = 500
+    while True:
+        if cookie and any(c.get("name") == cookie for c in context.cookies()):
+            return True
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return False
+        step_ms = min(delay_ms, remaining_ms)
+        if selector:
+            try:
+                page.wait_for_selector(selector, timeout=step_ms)
+                return True
+            except PWTimeoutError:
+                pass
+        else:
+            page.wait_for_timeout(step_ms)
+        delay_ms = min(delay_ms * 2, 2000)
+
+
 def login_and_save_session() -> None:
     """Open a headful Chromium with a persistent user-data dir for manual login.
 
     Steps:
-    - Launch persistent context (headful by default) with locale/timezone/proxy
+    - Get the profile's persistent context (headful by default) with locale/timezone/proxy
     - Open Shopee domain homepage
     - User performs login manually (OTP/CAPTCHA as needed)
     - Press Enter in terminal to persist cookies to storage_state.json
@@ -51,51 +213,39 @@ def login_and_save_session() -> None:
     _ensure_playwright_browsers_path()
     state_path = storage_state_path()
 
-    with sync_playwright() as p:
-        launch_kwargs = {
-            "headless": settings.headless,
-            "locale": settings.locale,
-            "timezone_id": settings.timezone_id,
-        }
-        if settings.proxy_url:
-            launch_kwargs["proxy"] = {"server": settings.proxy_url}
-
-        if settings.browser_executable_path:
-            print(f"[Login] Using executable: {settings.browser_executable_path}")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                executable_path=settings.browser_executable_path,
-                **launch_kwargs,
-            )
-        elif settings.browser_channel:
-            print(f"[Login] Using channel: {settings.browser_channel}")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                channel=settings.browser_channel,
-                **launch_kwargs,
-            )
-        else:
-            print("[Login] Using bundled Chromium")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                **launch_kwargs,
-            )
+    manager = BrowserManager.instance()
+    context = manager.get_persistent_context(settings.user_data_dir, _launch_kwargs(), tag="Login")
+    try:
+        page = context.new_page()
+        # networkidle can hang on analytics beacons: wait for the DOM plus a page landmark instead
+        page.goto(f"https://{settings.shopee_domain}/", wait_until="domcontentloaded")
         try:
-            page = context.new_page()
-            page.goto(f"https://{settings.shopee_domain}/", wait_until="networkidle")
-            print("\n[Login] Um navegador foi aberto. Faça login na Shopee.")
+            page.wait_for_selector("header, input[name='loginKey']", timeout=10_000)
+        except PWTimeoutError:
+            pass  # slow or unusual page; the user can still log in in the open window
+        print("\n[Login] Um navegador foi aberto. Faça login na Shopee.")
+        if settings.login_detect_selector or settings.login_detect_cookie:
+            print("[Login] Aguardando o login ser detectado automaticamente...")
+            if _wait_for_login(page, context):
+                print("[Login] Login detectado.")
+            else:
+                print("[Login] Login não detectado a tempo.")
+                input("Pressione Enter para salvar a sessão...")
+        else:
             print("Depois de concluir o login (e ver a home autenticada), volte ao terminal.")
             input("Pressione Enter para salvar a sessão...")
-            context.storage_state(path=str(state_path))
-            print(f"[Login] Sessão salva em: {state_path}")
-        finally:
-            context.close()
+        context.storage_state(path=str(state_path))
+        print(f"[Login] Sessão salva em: {state_path}")
+    finally:
+        # The profile stays open in the manager: a search in this process reuses it warm
+        manager.release(context)
 
 
 def create_authenticated_context() -> Tuple[Browser, BrowserContext]:
     """Create a Chromium browser and authenticated context from storage_state.
 
-    Returns (browser, context). Caller should close both after use.
+    Returns (browser, context). The browser is shared by the process: callers
+    close only the context.
     """
     ensure_data_dirs()
     _ensure_playwright_browsers_path()
@@ -105,19 +255,7 @@ def create_authenticated_context() -> Tuple[Browser, BrowserContext]:
             f"Storage state não encontrado em '{state_path}'. Rode 'python cli.py login' primeiro."
         )
 
-    p = sync_playwright().start()
-    launch_kwargs = {"headless": settings.headless}
-    if settings.proxy_url:
-        launch_kwargs["proxy"] = {"server": settings.proxy_url}
-    if settings.browser_executable_path:
-        print(f"[Search] Using executable: {settings.browser_executable_path}")
-        browser = p.chromium.launch(executable_path=settings.browser_executable_path, **launch_kwargs)
-    elif settings.browser_channel:
-        print(f"[Search] Using channel: {settings.browser_channel}")
-        browser = p.chromium.launch(channel=settings.browser_channel, **launch_kwargs)
-    else:
-        print("[Search] Using bundled Chromium")
-        browser = p.chromium.launch(**launch_kwargs)
+    browser = BrowserManager.instance().browser(_launch_kwargs())
 
     context_kwargs = {
         "storage_state": str(state_path),
@@ -128,23 +266,121 @@ def create_authenticated_context() -> Tuple[Browser, BrowserContext]:
     return browser, context
 
 
-def _build_chromium_args() -> list[str]:
+@lru_cache(maxsize=None)
+def _build_chromium_args(disable_3pc: bool) -> Tuple[str, ...]:
     args: list[str] = []
     # Help some embedded widgets (e.g., CAPTCHA) that rely on 3P cookies
-    if settings.disable_3pc_phaseout:
+    if disable_3pc:
         args.append("--test-third-party-cookie-phase-out=false")
     # Some evasions (use judiciously; Playwright already masks webdriver)
     args.append("--disable-blink-features=AutomationControlled")
-    return args
+    return tuple(args)  # immutable: the cached value is shared between callers
 
 
+@lru_cache(maxsize=32)
 def _accept_language_header(locale_code: str) -> str:
-    # Simple mapping: "pt-BR,pt;q=0.9"
+    # Simple mapping: "pt-BR,pt;q=0.9"; a bare language ("pt") is sent as-is
     primary = locale_code
     base = locale_code.split("-")[0]
     if base != primary:
         return f"{primary},{base};q=0.9"
-    return f"{primary},{base};q=0.9"
+    return primary
+
+
+# Not needed to read result cards: skipping them cuts most of the page's bandwidth
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+_BLOCKED_HOST_PARTS = ("google-analytics", "doubleclick", "facebook.net", "hotjar")
+
+
+def _is_heavy_request(request) -> bool:
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        return True
+    # Match the host only (not paths/queries); a plain loop avoids any()'s generator frame
+    host = request.url.split("/", 3)[2] if "//" in request.url else ""
+    for part in _BLOCKED_HOST_PARTS:
+        if part in host:
+            return True
+    return False
+
+
+def _block_heavy_route(route) -> None:
+    if _is_heavy_request(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _install_resource_blocker(context: BrowserContext) -> Tuple[str, Callable[[Any], None]]:
+    # A handler object per session, so unroute() removes this registration only
+    def handler(route) -> None:
+        _block_heavy_route(route)
+
+    context.route("**/*", handler)
+    return "**/*", handler
+
+
+# Static assets repeated across search pages; documents/XHR (the data) are never cached
+_CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet"})
+# Playwright routes match on the URL only: intercept just .js/.css URLs instead of every request
+_CACHEABLE_URL = re.compile(r"^[^?#]*\.(?:js|css)(?:[?#]|$)")
+_RESPONSE_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _response_cache_dir() -> Path:
+    return Path(settings.data_dir) / "response_cache"
+
+
+def _get_response_cache() -> ResponseCache:
+    """Process-wide cache, loaded from the previous run on first use and saved once at exit."""
+    global _RESPONSE_CACHE
+    with _CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            cache_dir = _response_cache_dir()
+            _RESPONSE_CACHE = ResponseCache.load(cache_dir, settings.response_cache_mb << 20)
+            atexit.register(_RESPONSE_CACHE.save, cache_dir)
+        return _RESPONSE_CACHE
+
+
+def _cached_route(cache: ResponseCache) -> Callable[[Any], None]:
+    def handler(route) -> None:
+        request = route.request
+        if (
+            request.method != "GET"
+            or request.resource_type not in _CACHEABLE_RESOURCE_TYPES
+            or _is_heavy_request(request)
+        ):
+            route.fallback()  # next handler (resource blocker) or the network
+            return
+        hit = cache.get(request.url)
+        if hit is not None:
+            status, headers, body = hit
+            route.fulfill(status=status, headers=headers, body=body)
+            return
+        response = route.fetch()
+        if response.status == 200:
+            cache.put(request.url, response.status, response.headers, response.body(), cache_max_age(response.headers))
+        route.fulfill(response=response)
+
+    return handler
+
+
+def _prepare_search_context(context: BrowserContext) -> Callable[[], None]:
+    """Install request routing on a search context and return its close function."""
+    manager = BrowserManager.instance()
+    routes: List[Tuple[Any, Callable[[Any], None]]] = []
+    if settings.block_heavy_resources:
+        routes.append(_install_resource_blocker(context))
+    if settings.response_cache:
+        # Registered last so it runs first; it falls back to the blocker for everything it doesn't serve
+        handler = _cached_route(_get_response_cache())
+        context.route(_CACHEABLE_URL, handler)
+        routes.append((_CACHEABLE_URL, handler))
+
+    def release() -> None:
+        manager.release(context, routes)
+
+    return release
 
 
 def create_search_context() -> Tuple[Browser | None, BrowserContext, callable]:
@@ -161,82 +397,26 @@ def create_search_context() -> Tuple[Browser | None, BrowserContext, callable]:
             f"Storage state não encontrado em '{state_path}'. Rode 'python cli.py login' primeiro."
         )
 
-    p = sync_playwright().start()
-    launch_kwargs = {
-        "headless": settings.headless,
-        "args": _build_chromium_args(),
-    }
-    if settings.proxy_url:
-        launch_kwargs["proxy"] = {"server": settings.proxy_url}
-
+    manager = BrowserManager.instance()
+    launch_kwargs = _launch_kwargs()
     accept_lang = _accept_language_header(settings.locale)
 
-    if settings.use_persistent_context_for_search:
+    # A shared CDP browser has no local profile to reuse: always hand out a fresh context
+    if settings.use_persistent_context_for_search and not settings.cdp_endpoint:
         # Reuse the same persistent user profile to keep fingerprint/session aligned
-        if settings.browser_executable_path:
-            print(f"[Search] Using executable (persistent): {settings.browser_executable_path}")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                executable_path=settings.browser_executable_path,
-                locale=settings.locale,
-                timezone_id=settings.timezone_id,
-                **launch_kwargs,
-            )
-        elif settings.browser_channel:
-            print(f"[Search] Using channel (persistent): {settings.browser_channel}")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                channel=settings.browser_channel,
-                locale=settings.locale,
-                timezone_id=settings.timezone_id,
-                **launch_kwargs,
-            )
-        else:
-            print("[Search] Using bundled Chromium (persistent)")
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=settings.user_data_dir,
-                locale=settings.locale,
-                timezone_id=settings.timezone_id,
-                **launch_kwargs,
-            )
-
+        context = manager.get_persistent_context(settings.user_data_dir, launch_kwargs)
         # Align headers like Accept-Language
         context.set_extra_http_headers({"Accept-Language": accept_lang})
 
-        def _close():
-            try:
-                context.close()
-            finally:
-                p.stop()
-
-        return None, context, _close
+        return None, context, _prepare_search_context(context)
 
     # Non-persistent mode (default prior behavior): load storage_state into a fresh context
-    if settings.browser_executable_path:
-        print(f"[Search] Using executable: {settings.browser_executable_path}")
-        browser = p.chromium.launch(executable_path=settings.browser_executable_path, **launch_kwargs)
-    elif settings.browser_channel:
-        print(f"[Search] Using channel: {settings.browser_channel}")
-        browser = p.chromium.launch(channel=settings.browser_channel, **launch_kwargs)
-    else:
-        print("[Search] Using bundled Chromium")
-        browser = p.chromium.launch(**launch_kwargs)
-
     context_kwargs = {
         "storage_state": str(state_path),
         "locale": settings.locale,
         "timezone_id": settings.timezone_id,
         "extra_http_headers": {"Accept-Language": accept_lang},
     }
-    context = browser.new_context(**context_kwargs)
-
-    def _close():
-        try:
-            context.close()
-        finally:
-            try:
-                browser.close()
-            finally:
-                p.stop()
-
-    return browser, context, _close
+    context = manager.get_context(launch_kwargs, **context_kwargs)
+    # Only the context is disposed: the browser and driver stay up for the next session
+    return manager.browser(launch_kwargs), context, _prepare_search_context(context)
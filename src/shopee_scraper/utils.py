@@ -1,19 +1,71 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
+import os
 import random
+import threading
 import time
+from collections import OrderedDict
+from itertools import chain
 from pathlib import Path
-from typing import Any, Iterable, List, Mapping, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # stdlib json fallback
 
 from .config import settings
 
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+_LOCAL = threading.local()
+
+
+def _rng() -> random.Random:
+    """Per-thread generator seeded from os.urandom: no shared global state between threads."""
+    r = getattr(_LOCAL, "rng", None)
+    if r is None:
+        r = _LOCAL.rng = random.Random(os.urandom(8))
+    return r
+
+
 def jitter_sleep(min_s: Optional[float] = None, max_s: Optional[float] = None) -> None:
     a = min_s if min_s is not None else settings.min_delay
     b = max_s if max_s is not None else settings.max_delay
-    time.sleep(random.uniform(a, b))
+    time.sleep(a + (b - a) * _rng().random())
+
+
+# Directories already created by this process: repeat writes skip the stat/mkdir syscalls
+_MKDIR_CACHE: Set[str] = set()
+T = TypeVar("T")
+
+
+def _ensure_dir(p: Path) -> None:
+    key = str(p)
+    if key in _MKDIR_CACHE:
+        return
+    p.mkdir(parents=True, exist_ok=True)
+    _MKDIR_CACHE.add(key)
+
+
+def _in_dir(path: Path, op: Callable[[], T]) -> T:
+    """Run ``op``, which creates a file in ``path.parent``.
+
+    The directory comes from the cache; if it was removed meanwhile (e.g. data/
+    cleared during a long queue run), it is re-created and ``op`` retried once.
+    """
+    _ensure_dir(path.parent)
+    try:
+        return op()
+    except FileNotFoundError:
+        _MKDIR_CACHE.discard(str(path.parent))
+        _ensure_dir(path.parent)
+        return op()
 
 
 def ensure_data_dir() -> Path:
@@ -22,27 +74,97 @@ def ensure_data_dir() -> Path:
     return p
 
 
+def _tmp_path(path: Path) -> Path:
+    # "<name>.tmp" next to the target; with_suffix(".tmp.json") would mangle compound suffixes
+    return path.with_name(path.name + ".tmp")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename in ``directory`` (no-op where directories can't be opened, e.g. Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_bytes_atomic(data: bytes, path: Path, fsync: bool = False) -> None:
+    """Write pre-serialized bytes via a temp file + rename so readers never see partial output.
+
+    Exports are re-runnable, so by default nothing is forced to disk; ``fsync=True``
+    syncs the file before the rename and the directory after it (crash-safe).
+    """
+    tmp = _tmp_path(path)
+    with _in_dir(path, lambda: tmp.open("wb")) as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    tmp.replace(path)
+    if fsync:
+        _fsync_dir(path.parent)
+
+
 def write_json(rows: List[Mapping[str, Any]], path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(".tmp.json")
-    with tmp.open("w", encoding="utf-8") as f:
+    if orjson is not None:
+        # Same layout as json.dump(indent=2, ensure_ascii=False), written as one UTF-8 buffer
+        write_bytes_atomic(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS), path)
+        return
+    tmp = _tmp_path(path)
+    with _in_dir(path, lambda: tmp.open("w", encoding="utf-8")) as f:
         json.dump(rows, f, ensure_ascii=False, indent=2)
     tmp.replace(path)
 
 
-def write_csv(rows: Iterable[Mapping[str, Any]], path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    rows = list(rows)
-    if not rows:
+def write_json_stream(rows: Iterable[Mapping[str, Any]], path: Path) -> None:
+    """Write a JSON array one row per line, consuming ``rows`` lazily (never held as a list)."""
+    tmp = _tmp_path(path)
+    with _in_dir(path, lambda: tmp.open("wb", buffering=1 << 16)) as f:
+        f.write(b"[")
+        sep = b"\n"
+        for r in rows:
+            f.write(sep)
+            if orjson is not None:
+                f.write(orjson.dumps(r, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(r, ensure_ascii=False).encode("utf-8"))
+            sep = b",\n"
+        f.write(b"]" if sep == b"\n" else b"\n]")
+    tmp.replace(path)
+
+
+def write_csv(
+    rows: Iterable[Mapping[str, Any]],
+    path: Path,
+    fieldnames: Optional[Sequence[str]] = None,
+    sort_fields: bool = True,
+) -> None:
+    """Write rows as CSV. With ``fieldnames`` the rows are streamed in one pass;
+    without, they are buffered to collect the union of keys for the header
+    (sorted, or in first-seen order with ``sort_fields=False``)."""
+    if fieldnames is None:
+        rows = list(rows)
+        # dict.update merges each row's keys in C, in first-seen order (values are ignored)
+        keys: Dict[str, Any] = {}
+        merge = keys.update
+        for r in rows:
+            merge(r)
+        fieldnames = sorted(keys) if sort_fields else list(keys)
+    it = iter(rows)
+    first = next(it, None)
+    if first is None:
         # create empty file with no headers
-        path.touch()
+        _in_dir(path, path.touch)
         return
-    fieldnames = sorted({k for r in rows for k in r.keys()})
-    tmp = path.with_suffix(".tmp.csv")
-    with tmp.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    tmp = _tmp_path(path)
+    with _in_dir(path, lambda: tmp.open("w", encoding="utf-8", newline="", buffering=1 << 16)) as f:
+        # Plain writer over aligned value lists: skips DictWriter's per-row key checks
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows([r.get(k, "") for k in fieldnames] for r in chain((first,), it))
     tmp.replace(path)
 
 
@@ -54,32 +176,212 @@ def current_profile_name() -> str:
     return p.name or "default"
 
 
+# Last (status, reason, ts) written per status file: repeated marks skip the disk write
+_SESSION_STATUS_WRITTEN: Dict[Path, Tuple[str, str, int]] = {}
+# ...but an unchanged status is still re-stamped this often so "ts" doesn't go stale
+_SESSION_STATUS_REFRESH_S = 60
+
+
 def mark_session_status(profile: str, status: str, reason: str) -> Path:
-    out_dir = Path(settings.data_dir) / "session_status"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{profile}.json"
+    out_path = Path(settings.data_dir) / "session_status" / f"{profile}.json"
+    ts = int(time.time())
+    last = _SESSION_STATUS_WRITTEN.get(out_path)
+    if (
+        last is not None
+        and last[:2] == (status, reason)
+        and ts - last[2] < _SESSION_STATUS_REFRESH_S
+        and out_path.exists()
+    ):
+        return out_path
     payload = {
         "profile": profile,
         "status": status,
         "reason": reason,
-        "ts": int(time.time()),
+        "ts": ts,
     }
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    # Other tools read this file to pick a healthy profile: make the update crash-safe
+    data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    write_bytes_atomic(data, out_path, fsync=True)
+    _SESSION_STATUS_WRITTEN[out_path] = (status, reason, ts)
     return out_path
 
 
 # ----------------------- Rate limiter -----------------------
 
 class RateLimiter:
+    """Spaces calls ``60 / per_minute`` seconds apart; safe to share between threads."""
+
     def __init__(self, per_minute: int) -> None:
         self.per_minute = max(1, int(per_minute))
         self.interval = 60.0 / float(self.per_minute)
         self._last = 0.0
+        self._lock = threading.Lock()
 
     def acquire(self) -> None:
-        now = time.time()
-        wait = self._last + self.interval - now
+        # Reserve the next slot under the lock (monotonic: immune to clock jumps), sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            wait = self._last + self.interval - now
+            self._last = now if wait <= 0 else self._last + self.interval
         if wait > 0:
             time.sleep(wait)
-        self._last = time.time()
+
+
+# ----------------------- Response cache -----------------------
+
+# Response headers that no longer describe a cached (already decoded) body
+_UNCACHED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "set-cookie"})
+
+
+def cache_max_age(headers: Mapping[str, str]) -> int:
+    """Seconds a response may be reused per its Cache-Control header (0 = don't cache)."""
+    cc = (headers.get("cache-control") or "").lower()
+    if not cc or "no-store" in cc or "no-cache" in cc or "private" in cc:
+        return 0
+    for part in cc.split(","):
+        name, _, value = part.strip().partition("=")
+        if name == "max-age":
+            try:
+                return max(0, int(value))
+            except ValueError:
+                return 0
+    return 0
+
+
+def _body_file_name(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".bin"
+
+
+def _is_body_file_name(name: Any) -> bool:
+    # Exactly what _body_file_name produces: no separators, so no path escapes the cache dir
+    return isinstance(name, str) and len(name) == 44 and name.endswith(".bin") and all(
+        c in "0123456789abcdef" for c in name[:40]
+    )
+
+
+class ResponseCache:
+    """Thread-safe LRU of GET responses keyed by URL, bounded by total body bytes.
+
+    Entries are (status, headers, body, expires_at) with a wall-clock expiry so the
+    cache can be saved to a directory and reused by the next run: a JSON index
+    (url, status, headers, expiry, body file) plus one raw file per body. Nothing
+    executable is read back.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, max_bytes: int = 64 << 20) -> None:
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, Tuple[int, Dict[str, str], bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._unsaved: Set[str] = set()  # URLs whose body isn't on disk yet
+        # URLs this instance dropped since the last save: the only body files save() removes,
+        # since other processes may share the directory
+        self._evicted: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        with self._lock:
+            entry = self._items.get(url)
+            if entry is None:
+                return None
+            if entry[3] <= time.time():
+                self._drop(url)
+                return None
+            self._items.move_to_end(url)
+            return entry[0], entry[1], entry[2]
+
+    def put(self, url: str, status: int, headers: Mapping[str, str], body: bytes, max_age: int) -> None:
+        if max_age <= 0 or len(body) > self.max_bytes:
+            return
+        kept = {k: v for k, v in headers.items() if k.lower() not in _UNCACHED_HEADERS}
+        with self._lock:
+            self._insert(url, (status, kept, body, time.time() + max_age))
+            self._unsaved.add(url)
+
+    def _insert(self, url: str, entry: Tuple[int, Dict[str, str], bytes, float]) -> None:
+        # Caller holds the lock
+        if url in self._items:
+            self._drop(url)
+        self._items[url] = entry
+        self._evicted.discard(url)
+        self._size += len(entry[2])
+        while self._size > self.max_bytes:
+            self._drop(next(iter(self._items)))
+        self._dirty = True
+
+    def _drop(self, url: str) -> None:
+        # Caller holds the lock
+        self._size -= len(self._items.pop(url)[2])
+        self._unsaved.discard(url)
+        self._evicted.add(url)
+        self._dirty = True
+
+    def save(self, directory: Path) -> None:
+        """Write new bodies and the index to ``directory``; unchanged caches are skipped.
+
+        Body files already on disk are kept as-is. Only the files of entries this
+        instance evicted or saw expire are removed.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            live = [(k, v) for k, v in self._items.items() if v[3] > now]
+            new_bodies = [(k, v[2]) for k, v in live if k in self._unsaved]
+            gone = self._evicted.union(k for k, v in self._items.items() if v[3] <= now)
+            self._unsaved.clear()
+            self._evicted.clear()
+            self._dirty = False
+        index = [
+            [url, status, headers, expires_at, _body_file_name(url)]
+            for url, (status, headers, _, expires_at) in live
+        ]
+        for url, body in new_bodies:
+            write_bytes_atomic(body, directory / _body_file_name(url))
+        data = orjson.dumps(index) if orjson is not None else json.dumps(index).encode("utf-8")
+        write_bytes_atomic(data, directory / self.INDEX)
+        for url in gone:
+            try:
+                (directory / _body_file_name(url)).unlink()
+            except OSError:
+                pass
+
+    @classmethod
+    def load(cls, directory: Path, max_bytes: int = 64 << 20) -> "ResponseCache":
+        """Load a cache saved by ``save``; missing, malformed or expired entries are ignored."""
+        cache = cls(max_bytes)
+        try:
+            index = _json_loads((directory / cls.INDEX).read_bytes())
+        except (OSError, ValueError):
+            return cache
+        if not isinstance(index, list):
+            return cache
+        now = time.time()
+        with cache._lock:
+            for row in index:
+                if not (isinstance(row, list) and len(row) == 5):
+                    continue
+                url, status, headers, expires_at, name = row
+                if not (
+                    isinstance(url, str)
+                    and type(status) is int
+                    and isinstance(headers, dict)
+                    and isinstance(expires_at, (int, float))
+                    and _is_body_file_name(name)
+                ):
+                    continue
+                if expires_at <= now:
+                    cache._evicted.add(url)  # its body file goes at the next save
+                    continue
+                try:
+                    body = (directory / name).read_bytes()
+                except OSError:
+                    continue
+                cache._insert(url, (status, headers, body, float(expires_at)))
+            cache._dirty = bool(cache._evicted)
+        return cache
@@ -0,0 +1,101 @@
+from src.shopee_scraper.cdp.collector import CdpFilters
+
+
+def test_cdp_filters_literal_and_regex_patterns():
+    filters = CdpFilters.from_patterns([r"/api/v4/pdp/get_pc", r"/api/v\d+/search_items"])
+    assert filters.literals == ["/api/v4/pdp/get_pc"]
+    assert len(filters.url_regexes) == 1
+
+    assert filters.match("https://shopee.com.br/api/v4/pdp/get_pc?item_id=1")
+    assert filters.match("https://shopee.com.br/api/v2/search_items?by=relevancy")
+    assert not filters.match("https://shopee.com.br/api/v4/account/basic")
+
+
+def test_cdp_filters_regex_token_prefilter():
+    filters = CdpFilters.from_patterns([r"/api/v\d+/search_items", r"/api/(v4|v2)/recommend/"])
+    assert filters.regex_tokens == ["/search_items", None]
+
+    assert filters.match("https://shopee.com.br/api/v2/search_items?by=pop")
+    assert filters.match("https://shopee.com.br/api/v4/recommend/recommend")
+    assert not filters.match("https://shopee.com.br/static/search_items.js")
+
+
+def test_accept_language_header():
+    from src.shopee_scraper.cdp.collector import _accept_language_header
+
+    assert _accept_language_header("pt-BR") == "pt-BR,pt;q=0.9"
+    assert _accept_language_header("pt") == "pt"
+
+
+def test_merge_jsonl_files_keeps_records_line_delimited(tmp_path):
+    from src.shopee_scraper.cdp.collector import _merge_jsonl_files
+
+    a = tmp_path / "a.jsonl"
+    b = tmp_path / "b.jsonl"
+    empty = tmp_path / "empty.jsonl"
+    a.write_bytes(b'{"a": 1}\n{"a": 2}\n')
+    b.write_bytes(b'{"b": 1}')  # no trailing newline
+    empty.write_bytes(b"")
+    out = tmp_path / "merged.jsonl"
+
+    _merge_jsonl_files([a, empty, b, a], out)
+    assert out.read_bytes() == b'{"a": 1}\n{"a": 2}\n{"b": 1}\n{"a": 1}\n{"a": 2}\n'
+
+
+def _collector(monkeypatch, queue_size: int = 4096):
+    import types
+
+    from src.shopee_scraper.cdp import collector as collector_mod
+
+    monkeypatch.setattr(collector_mod, "pychrome", types.SimpleNamespace(Browser=lambda url: None))
+    monkeypatch.setattr(collector_mod, "_EVENT_QUEUE_SIZE", queue_size)
+    return collector_mod.CdpCollector(port=9222, filters=CdpFilters.from_patterns(["/api/v4/pdp/get_pc"]))
+
+
+def test_enqueue_blocks_on_a_full_queue_instead_of_dropping(monkeypatch):
+    import threading
+
+    collector = _collector(monkeypatch, queue_size=1)
+    release = threading.Event()
+    handled = []
+
+    def handler(tab, kwargs):
+        release.wait(5)
+        handled.append(kwargs["n"])
+
+    producer = threading.Thread(target=lambda: [collector._enqueue(handler, None, {"n": n}) for n in range(5)])
+    producer.start()
+    producer.join(0.3)
+    assert producer.is_alive()  # backpressure: the listener waits for room in the queue
+    release.set()
+    producer.join(5)
+    collector.drain()
+    collector.close()
+    assert handled == [0, 1, 2, 3, 4]
+
+
+def test_navigation_done_waits_for_every_matching_response_of_its_load(monkeypatch):
+    import types
+
+    collector = _collector(monkeypatch)
+    tab = types.SimpleNamespace(call_method=lambda method, requestId: {"body": requestId, "base64Encoded": False})
+    url = "https://shopee.com.br/api/v4/pdp/get_pc?item_id=1"
+
+    def sent(rid, loader):
+        collector._on_request_will_be_sent(tab, {"requestId": rid, "loaderId": loader, "request": {"url": url}})
+
+    sent("old", "L0")  # still in flight from the tab's previous navigation
+    sent("r1", "L1")
+    sent("r2", "L1")
+    collector._on_request_will_be_sent(tab, {"requestId": "x", "loaderId": "L1", "request": {"url": "/other"}})
+    collector._on_loading_finished(tab, {"requestId": "old"})
+    assert not collector.navigation_done("L1", quiet_s=0)  # a late body of L0 doesn't count
+    collector._on_loading_finished(tab, {"requestId": "r1"})
+    assert not collector.navigation_done("L1", quiet_s=0)  # r2 is still in flight
+    collector._on_loading_finished(tab, {"requestId": "r2"})
+    assert collector.navigation_done("L1", quiet_s=0)
+    assert not collector.navigation_done("L1", quiet_s=60) and not collector.navigation_done(None, quiet_s=0)
+
+    collector.forget_navigation("L1")
+    assert "L1" not in collector._navs and not collector.navigation_done("L1", quiet_s=0)
+    collector.close()
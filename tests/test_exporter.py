@@ -3,6 +3,8 @@ import json
 from pathlib import Path
 
 from src.shopee_scraper.cdp.exporter import (
+    CaptureRecord,
+    _iter_capture_records,
     _loads_body,
     normalize_pdp_record,
     export_pdp_from_jsonl,
@@ -76,3 +78,67 @@ def test_export_search_from_jsonl_items_and_data_items(tmp_path: Path):
     assert len(rows) >= 2
     assert all("item_id" in r and "shop_id" in r for r in rows)
 
+
+def test_export_search_from_jsonl_dedups_by_shop_and_item(tmp_path: Path):
+    settings.data_dir = str(tmp_path)
+    payload = {"items": [
+        {"item_basic": {"itemid": 10, "shopid": 20, "name": "A"}},
+        {"item_basic": {"itemid": 10, "shopid": 20, "name": "A again"}},
+        {"item_basic": {"name": "no ids"}},
+    ]}
+    rec = {"url": "https://x", "status": 200, "headers": {}, "body": json.dumps(payload), "base64": False}
+    # Same items in a differently formatted body, then a byte-identical repeat of the first capture
+    rec2 = dict(rec, body=json.dumps(payload, indent=1))
+    jpath = tmp_path / "cdp_search_dups.jsonl"
+    jpath.write_text("".join(json.dumps(r) + "\n" for r in (rec, rec2, rec)), encoding="utf-8")
+
+    _, _, rows = export_search_from_jsonl(jpath)
+    keyed = [r for r in rows if r["item_id"] is not None]
+    assert len(keyed) == 1 and keyed[0]["title"] == "A"
+    # Rows without a (shop_id, item_id) key are never collapsed, even from a repeated body
+    assert len(rows) - len(keyed) == 3
+
+
+def test_exports_of_repeated_bodies_match_fully_parsed_rows(tmp_path: Path):
+    settings.data_dir = str(tmp_path)
+    search = {"items": [{"item_basic": {"itemid": 10, "shopid": 20, "name": "A"}}, {"item_basic": {"name": "no ids"}}]}
+    pdp_keyed = {"data": {"item": {"item_id": 1, "shop_id": 2, "title": "P"}}}
+    pdp_keyless = {"data": {"item": {"title": "no ids"}}}
+
+    def export(exporter, payloads, name, reformat):
+        # Re-indenting every body gives each line distinct bytes, so every body is parsed
+        bodies = [json.dumps(p, indent=i if reformat else None) for i, p in enumerate(payloads)]
+        jpath = tmp_path / f"{name}.jsonl"
+        recs = [{"url": "https://x", "status": 200, "body": b, "base64": False} for b in bodies]
+        jpath.write_text("".join(json.dumps(r) + "\n" for r in recs), encoding="utf-8")
+        return exporter(jpath)[2]
+
+    search_payloads = [search, search, search]
+    rows = export(export_search_from_jsonl, search_payloads, "cdp_search_rep", False)
+    assert rows == export(export_search_from_jsonl, search_payloads, "cdp_search_full", True)
+    pdp_payloads = [pdp_keyed, pdp_keyless, pdp_keyed, pdp_keyless, pdp_keyless]
+    rows = export(export_pdp_from_jsonl, pdp_payloads, "cdp_pdp_rep", False)
+    assert rows == export(export_pdp_from_jsonl, pdp_payloads, "cdp_pdp_full", True)
+    assert [r["item_id"] for r in rows] == [1, None, None, None]
+
+
+def test_iter_capture_records_keeps_loosely_typed_fields(tmp_path: Path):
+    jpath = tmp_path / "cdp_mixed.jsonl"
+    lines = [
+        {"body": "{}", "base64": None, "url": "u1", "status": "200"},
+        {"body": None, "url": None},
+        {"headers": {}, "body": "{}", "base64": 1, "status": 404},
+    ]
+    jpath.write_text("\n".join(json.dumps(r) for r in lines) + "\n\nnot json\n{broken\n", encoding="utf-8")
+    assert list(_iter_capture_records(jpath)) == [
+        CaptureRecord("{}", False, "u1", "200"),
+        CaptureRecord(None, False, None, None),
+        CaptureRecord("{}", True, None, 404),
+    ]
+
+
+def test_iter_capture_records_accepts_padded_and_bom_lines(tmp_path: Path):
+    jpath = tmp_path / "cdp_padded.jsonl"
+    rec = json.dumps({"body": "{}", "url": "u"})
+    jpath.write_bytes(b"\xef\xbb\xbf" + rec.encode() + b"\r\n  \t" + rec.encode() + b"  \n \n")
+    assert list(_iter_capture_records(jpath)) == [CaptureRecord("{}", False, "u", None)] * 2
@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+from src.shopee_scraper.metrics import aggregate_metrics
+
+
+def _summary(ts: int, profile, proxy=None, captured: int = 1) -> dict:
+    return {"event": "cdp_capture_summary", "ts": ts, "profile": profile, "proxy": proxy, "captured": captured}
+
+
+def test_aggregate_metrics_filters(tmp_path: Path):
+    recs = [
+        _summary(100, "a"),
+        _summary(200, "a", "http://p1"),
+        _summary(300, "b", "http://p1", captured=0),
+        _summary(400, None),  # counted under "default"
+        {"event": "circuit_trip", "ts": 500, "profile": "a", "reason": "403"},
+        {"event": "circuit_trip", "profile": "a", "reason": "captcha"},  # no ts: treated as now
+    ]
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in recs) + "\nnot json\n", encoding="utf-8")
+
+    buckets, overall = aggregate_metrics(path)
+    assert overall.captures_total == 4 and overall.captures_ok == 3 and overall.blocks == 2
+
+    buckets, overall = aggregate_metrics(path, since_ts=250, profile_filter="a")
+    assert overall.captures_total == 0 and overall.blocks == 2
+    assert set(buckets) == {("a", None)}
+
+    _, overall = aggregate_metrics(path, profile_filter="default")
+    assert overall.captures_total == 1
+
+    _, overall = aggregate_metrics(path, proxy_filter="http://p1")
+    assert overall.captures_total == 2 and overall.captures_ok == 1
+
+
+def test_aggregate_metrics_cache_matches_full_scan(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    first = [_summary(100, "a"), _summary(200, "b", "http://p1", captured=0)]
+    path.write_text("".join(json.dumps(r) + "\n" for r in first), encoding="utf-8")
+    aggregate_metrics(path, cache=True)
+
+    # Appended events are picked up from the stored offset
+    more = [_summary(300, "a"), {"event": "circuit_trip", "ts": 400, "profile": "b", "proxy": "http://p1"}]
+    with path.open("a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in more))
+
+    for kwargs in ({}, {"since_ts": 250}, {"proxy_filter": "http://p1"}):
+        full_buckets, full = aggregate_metrics(path, **kwargs)
+        cached_buckets, cached = aggregate_metrics(path, cache=True, **kwargs)
+        assert cached == full
+        assert list(cached_buckets.items()) == list(full_buckets.items())
+
+
+def test_aggregate_metrics_split_across_workers(tmp_path: Path, monkeypatch):
+    from src.shopee_scraper import metrics
+
+    recs = [_summary(100 + i, "ab"[i % 2], captured=i % 3) for i in range(200)]
+    recs += [{"event": "circuit_trip", "ts": 400 + i, "profile": "b", "reason": "403"} for i in range(20)]
+    path = tmp_path / "events.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in recs), encoding="utf-8")
+    serial = aggregate_metrics(path, since_ts=150)
+
+    monkeypatch.setattr(metrics, "_PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(metrics, "_RANGE_MIN_BYTES", 1)
+    monkeypatch.setattr(metrics.os, "cpu_count", lambda: 3)
+    ranges = metrics._split_ranges(path, 0, path.stat().st_size)
+    assert len(ranges) == 3 and ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+    assert all(path.read_bytes()[start - 1 : start] == b"\n" for start, _ in ranges[1:])
+
+    buckets, overall = aggregate_metrics(path, since_ts=150)
+    assert list(buckets.items()) == list(serial[0].items())
+    assert overall == serial[1]
+    cached_buckets, cached = aggregate_metrics(path, since_ts=150, cache=True)
+    assert list(cached_buckets.items()) == list(serial[0].items()) and cached == serial[1]
+
+
+def test_aggregate_metrics_cache_keeps_metric_rows_and_skips_idle_saves(tmp_path: Path, monkeypatch):
+    from src.shopee_scraper import metrics
+
+    path = tmp_path / "events.jsonl"
+    recs = [{"event": "page_loaded", "ts": 100 + i, "profile": "c"} for i in range(50)]
+    recs += [_summary(200, "a"), {"event": "page_loaded", "ts": 300, "profile": "a"}]
+    path.write_text("".join(json.dumps(r) + "\n" for r in recs) + '{"event": "circuit', encoding="utf-8")
+
+    for kwargs in ({}, {"since_ts": 250}, {"since_ts": 400}):
+        cached_buckets, cached = aggregate_metrics(path, cache=True, **kwargs)
+        full_buckets, full = aggregate_metrics(path, **kwargs)
+        assert list(cached_buckets.items()) == list(full_buckets.items()) and cached == full
+
+    # Other events only record the latest ts of their (profile, proxy): one row per summary
+    state = json.loads(metrics._rollup_path(path).read_text(encoding="utf-8"))
+    assert state["seen"] == [["c", None, 149], ["a", None, 300]] and len(state["rows"]) == 1
+    assert state["offset"] == path.stat().st_size - len('{"event": "circuit')
+
+    saves = []
+    monkeypatch.setattr(metrics, "_save_rollup", lambda *args: saves.append(args))
+    aggregate_metrics(path, cache=True)
+    assert saves == []  # nothing complete was appended
+    with path.open("a", encoding="utf-8") as f:
+        f.write('_trip", "ts": 500, "profile": "a"}\n')
+    _, overall = aggregate_metrics(path, cache=True)
+    assert len(saves) == 1 and overall.blocks == 1
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+from src.shopee_scraper import scheduler
+from src.shopee_scraper.config import settings
+
+
+def test_task_queue_roundtrip_and_legacy_import(tmp_path: Path):
+    settings.data_dir = str(tmp_path)
+    legacy = tmp_path / "queue" / "tasks"
+    legacy.mkdir(parents=True)
+    (legacy / "old.json").write_text(json.dumps({
+        "id": "old", "kind": "cdp_search", "params": {"keyword": "k"}, "status": "pending",
+        "attempts": 0, "max_attempts": 2, "created_ts": 1, "updated_ts": 1, "result": {}, "error": None,
+    }), encoding="utf-8")
+
+    t = scheduler.add_task("cdp_search", {"keyword": "café", "pages": 2})
+    assert [x.id for x in scheduler.load_tasks()] == ["old", t.id]
+
+    t.status = "failed"
+    t.attempts = 2
+    t.result["jsonl"] = "data/x.jsonl"
+    t.error = "boom"
+    t.save()
+    (failed,) = scheduler.load_tasks(status_filter="failed")
+    assert failed == t
+    assert [x.id for x in scheduler.load_tasks(status_filter="pending")] == ["old"]
+
+    # In-place result changes are detected and written on the next save
+    failed.result["export_count"] = 3
+    failed.save()
+    assert scheduler.load_tasks(status_filter="failed")[0].result == {"jsonl": "data/x.jsonl", "export_count": 3}
@@ -0,0 +1,147 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.shopee_scraper import session
+
+
+class _Route:
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.action = None
+
+    def abort(self):
+        self.action = "abort"
+
+    def continue_(self):
+        self.action = "continue"
+
+
+@pytest.mark.parametrize(
+    "resource_type,url,action",
+    [
+        ("image", "https://cf.shopee.com.br/file/x.jpg", "abort"),
+        ("font", "https://shopee.com.br/f.woff2", "abort"),
+        ("script", "https://www.google-analytics.com/analytics.js", "abort"),
+        ("document", "https://shopee.com.br/search?keyword=x", "continue"),
+        ("xhr", "https://shopee.com.br/api/v4/search/search_items", "continue"),
+    ],
+)
+def test_block_heavy_route(resource_type, url, action):
+    route = _Route(resource_type, url)
+    session._block_heavy_route(route)
+    assert route.action == action
+
+
+class _LoginPage:
+    def __init__(self, context, appear_after: int):
+        self.context = context
+        self.appear_after = appear_after
+
+    def wait_for_timeout(self, ms):
+        self.context.polls += 1
+
+    def wait_for_selector(self, selector, timeout):
+        self.context.polls += 1
+        if self.context.polls < self.appear_after:
+            raise session.PWTimeoutError("not yet")
+
+
+class _LoginContext:
+    def __init__(self, cookie_after: int = 10**9):
+        self.polls = 0
+        self.cookie_after = cookie_after
+
+    def cookies(self):
+        return [{"name": "SPC_U"}] if self.polls >= self.cookie_after else []
+
+
+def test_wait_for_login(monkeypatch):
+    monkeypatch.setattr(session.settings, "login_timeout_ms", 60_000)
+    monkeypatch.setattr(session.settings, "login_detect_selector", None)
+    monkeypatch.setattr(session.settings, "login_detect_cookie", "SPC_U")
+    ctx = _LoginContext(cookie_after=3)
+    assert session._wait_for_login(_LoginPage(ctx, 0), ctx) and ctx.polls == 3
+
+    monkeypatch.setattr(session.settings, "login_detect_selector", "a[href*='/user/account']")
+    monkeypatch.setattr(session.settings, "login_detect_cookie", None)
+    ctx = _LoginContext()
+    assert session._wait_for_login(_LoginPage(ctx, 2), ctx) and ctx.polls == 2
+
+    monkeypatch.setattr(session.settings, "login_timeout_ms", 0)
+    ctx = _LoginContext()
+    assert not session._wait_for_login(_LoginPage(ctx, 5), ctx)
+
+
+def test_block_heavy_route_matches_host_only():
+    route = _Route("xhr", "https://shopee.com.br/api/v4/search/search_items?keyword=hotjar")
+    session._block_heavy_route(route)
+    assert route.action == "continue"
+
+
+def test_cache_route_only_intercepts_script_and_stylesheet_urls():
+    assert session._CACHEABLE_URL.search("https://deo.shopeemobile.com/shopee/app.9f1c.js")
+    assert session._CACHEABLE_URL.search("https://deo.shopeemobile.com/shopee/main.css?v=2")
+    assert not session._CACHEABLE_URL.search("https://shopee.com.br/api/v4/search/search_items?keyword=a.js")
+    assert not session._CACHEABLE_URL.search("https://shopee.com.br/search?keyword=json")
+
+
+class _Closable:
+    def __init__(self):
+        self.closed = False
+        self.pages = []
+        self.unrouted = []
+
+    def close(self):
+        self.closed = True
+
+    def unroute(self, pattern, handler=None):
+        self.unrouted.append((pattern, handler))
+
+
+def test_browser_manager_release_keeps_persistent_contexts_warm():
+    manager = session.BrowserManager()
+    persistent, page, fresh = _Closable(), _Closable(), _Closable()
+    persistent.pages.append(page)
+    manager._persistent["profile"] = persistent
+
+    manager.release(persistent)
+    assert not persistent.closed and page.closed and persistent.unrouted == []
+    manager.release(fresh)
+    assert fresh.closed
+
+    manager.shutdown()
+    assert persistent.closed and not manager._persistent
+
+
+class _RoutedContext(_Closable):
+    def __init__(self):
+        super().__init__()
+        self.routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def unroute(self, pattern, handler=None):
+        # Playwright semantics: without a handler every route on the pattern goes
+        self.routes = [r for r in self.routes if r[0] != pattern or (handler is not None and r[1] is not handler)]
+
+
+def test_release_removes_only_the_sessions_own_routes(monkeypatch):
+    manager = session.BrowserManager()
+    context = _RoutedContext()
+    manager._persistent["profile"] = context
+    monkeypatch.setattr(session.BrowserManager, "instance", classmethod(lambda cls: manager))
+    monkeypatch.setattr(session, "_get_response_cache", lambda: session.ResponseCache())
+    monkeypatch.setattr(session.settings, "block_heavy_resources", True)
+    monkeypatch.setattr(session.settings, "response_cache", True)
+
+    release_first = session._prepare_search_context(context)
+    first_routes = list(context.routes)
+    session._prepare_search_context(context)
+    second_routes = context.routes[len(first_routes):]
+    release_first()
+    # The second session on the shared profile keeps its blocker and cache routes
+    assert context.routes == second_routes and len(second_routes) == 2 and not context.closed
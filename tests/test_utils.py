@@ -21,3 +21,100 @@ def test_write_json_and_csv(tmp_path: Path):
     # number of data lines equals rows length
     assert len(content) == len(rows) + 1
 
+
+def test_write_csv_and_json_stream_from_generator(tmp_path: Path):
+    from src.shopee_scraper.utils import write_json_stream
+    import json
+
+    rows = [{"a": i, "b": f"x{i}"} for i in range(3)]
+    csv_path = tmp_path / "out.csv"
+    write_csv((r for r in rows), csv_path, fieldnames=["b", "a"])
+    assert csv_path.read_text(encoding="utf-8").splitlines() == ["b,a", "x0,0", "x1,1", "x2,2"]
+
+    json_path = tmp_path / "out.json"
+    write_json_stream((r for r in rows), json_path)
+    assert json.loads(json_path.read_text(encoding="utf-8")) == rows
+    write_json_stream(iter(()), json_path)
+    assert json.loads(json_path.read_text(encoding="utf-8")) == []
+
+
+def test_writers_recreate_a_removed_directory(tmp_path: Path, monkeypatch):
+    import shutil
+    from src.shopee_scraper import utils
+
+    monkeypatch.setattr(utils, "_MKDIR_CACHE", set())
+    monkeypatch.setattr(utils.settings, "data_dir", str(tmp_path / "data"))
+    monkeypatch.setattr(utils, "_SESSION_STATUS_WRITTEN", {})
+    out = tmp_path / "out"
+    for _ in range(2):  # second round: directories are cached but were deleted
+        write_csv([{"a": 1}], out / "x.csv")
+        write_csv([], out / "empty.csv")
+        write_json([{"a": 1}], out / "x.json")
+        utils.write_json_stream([{"a": 1}], out / "s.json")
+        status = utils.mark_session_status("p1", "healthy", "ok")
+        assert (out / "x.csv").exists() and (out / "empty.csv").exists() and status.exists()
+        shutil.rmtree(out)
+        shutil.rmtree(tmp_path / "data")
+
+
+def test_mark_session_status_skips_unchanged(tmp_path: Path, monkeypatch):
+    import json
+    from src.shopee_scraper import utils
+
+    monkeypatch.setattr(utils.settings, "data_dir", str(tmp_path))
+    monkeypatch.setattr(utils, "_SESSION_STATUS_WRITTEN", {})
+    out = utils.mark_session_status("p1", "degraded", "403")
+    out.write_text("{}", encoding="utf-8")  # sentinel: an unchanged mark must not rewrite it
+    assert utils.mark_session_status("p1", "degraded", "403") == out
+    assert out.read_text(encoding="utf-8") == "{}"
+
+    utils.mark_session_status("p1", "healthy", "ok")
+    assert json.loads(out.read_text(encoding="utf-8"))["status"] == "healthy"
+
+
+def test_response_cache_lru_and_persistence(tmp_path: Path):
+    import json
+    from src.shopee_scraper import utils
+    from src.shopee_scraper.utils import ResponseCache, cache_max_age
+
+    assert cache_max_age({"cache-control": "public, max-age=600"}) == 600
+    assert cache_max_age({"cache-control": "no-store"}) == 0
+    assert cache_max_age({}) == 0
+
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 200, {"content-encoding": "gzip", "content-type": "text/css"}, b"aaaa", 60)
+    cache.put("b", 200, {}, b"bbbb", 60)
+    cache.put("x", 200, {}, b"x", 0)  # not cacheable
+    assert cache.get("a") == (200, {"content-type": "text/css"}, b"aaaa")  # "a" is now most recent
+    cache.put("c", 200, {}, b"cccc", 60)  # over 10 bytes: evicts "b"
+    assert cache.get("b") is None and cache.get("x") is None and len(cache) == 2
+
+    cache_dir = tmp_path / "response_cache"
+    cache.save(cache_dir)
+    assert sorted(f.name for f in cache_dir.iterdir()) == sorted(
+        ["index.json", utils._body_file_name("a"), utils._body_file_name("c")]
+    )
+    loaded = ResponseCache.load(cache_dir, max_bytes=10)
+    assert loaded.get("c") == (200, {}, b"cccc") and len(loaded) == 2
+    assert len(ResponseCache.load(tmp_path / "missing")) == 0
+
+    # Only new bodies are written; bodies this instance evicted are removed from disk, while a
+    # body another process just wrote to the shared directory is left alone
+    other = cache_dir / utils._body_file_name("from-another-process")
+    other.write_bytes(b"zz")
+    loaded.put("d", 200, {}, b"dddd", 60)  # evicts "a"
+    loaded.save(cache_dir)
+    assert not (cache_dir / utils._body_file_name("a")).exists() and other.exists()
+    assert ResponseCache.load(cache_dir).get("d") == (200, {}, b"dddd")
+
+    # A tampered index can't point outside the cache directory
+    (cache_dir / "index.json").write_text(
+        json.dumps([["e", 200, {}, 9e12, "../../etc/passwd"]]), encoding="utf-8"
+    )
+    assert len(ResponseCache.load(cache_dir)) == 0
+
+
+def test_write_csv_first_seen_header(tmp_path: Path):
+    csv_path = tmp_path / "out.csv"
+    write_csv([{"b": 2, "a": 1}, {"a": 3, "c": 4}], csv_path, sort_fields=False)
+    assert csv_path.read_text(encoding="utf-8").splitlines()[0] == "b,a,c"